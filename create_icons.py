@@ -16,10 +16,11 @@ def create_svg_icon(color, filename):
 icons_dir = Path(__file__).parent / "icons"
 icons_dir.mkdir(exist_ok=True)
 
-# Create red, yellow, green icons
+# Create red, yellow, green, grey icons
 create_svg_icon("#dc2626", icons_dir / "pipeline-red.svg")     # Red (failed)
 create_svg_icon("#eab308", icons_dir / "pipeline-yellow.svg")  # Yellow (running)
 create_svg_icon("#16a34a", icons_dir / "pipeline-green.svg")   # Green (passed)
+create_svg_icon("#9ca3af", icons_dir / "pipeline-grey.svg")    # Grey (stale/unknown)
 
 print("\nIcons created successfully!")
 print(f"Location: {icons_dir.absolute()}")
@@ -0,0 +1,47 @@
+"""Circuit breaker for calls to a failing API."""
+
+import time
+
+
+class CircuitBreaker:
+    """Stops calling a failing service and probes it again after a cool-down.
+
+    States:
+    - "closed": requests are allowed; consecutive failures are counted
+    - "open": requests are refused until reset_timeout has elapsed
+    - "half_open": a single probe request is allowed; success closes the
+      circuit, failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=300, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+
+    def allow_request(self):
+        """Return True if a request may be made now."""
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        # Closed, or half-open with the probe already granted
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failure_count += 1
+        if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = self.clock()
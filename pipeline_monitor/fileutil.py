@@ -0,0 +1,27 @@
+"""File helpers shared by settings and state persistence."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_text(file_path, text, mode=0o644):
+    """Write text to file_path atomically with the given permissions.
+
+    The content is written to a temporary file in the same directory, synced
+    and renamed over the target, so readers see either the old or the new
+    file - never a truncated one.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        Path(tmp_path).replace(file_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
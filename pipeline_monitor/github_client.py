@@ -1,26 +1,134 @@
 import requests
 
+from pipeline_monitor.poll_cache import PollCacheClient, PollCacheUnavailableError
+from pipeline_monitor.status_rules import IGNORE, StatusRules
+from pipeline_monitor.token_pool import (
+    NoTokenError,
+    Token,
+    TokenPool,
+    TokenRefreshError,
+)
+
+# Seconds before a request is abandoned; polls run on the GTK main loop
+REQUEST_TIMEOUT = 10
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API cannot be reached or returns a bad response."""
+
 
 class GitHubClient:
-    def __init__(self, repo_owner, repo_name, api_token):
+    def __init__(self, repo_owner, repo_name, api_token, status_rules=None, cache_socket=None):
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.api_token = api_token
+        # api_token may be a single token string or a TokenPool
+        if isinstance(api_token, TokenPool):
+            self.token_pool = api_token
+        else:
+            self.token_pool = TokenPool([Token(api_token)])
+        self.status_rules = status_rules or StatusRules()
+        # Shared poll cache daemon, if one runs on this host
+        self.poll_cache = PollCacheClient(cache_socket) if cache_socket else None
+        # Validator state from the last response
+        self.etag = None
+        self.last_status = None
 
     def get_pipeline_status(self):
         url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/actions/runs"
-        headers = {"Authorization": f"Bearer {self.api_token}"}
-        response = requests.get(url, headers=headers)
-        data = response.json()
-
-        # Check if there are any workflow runs
-        if not data.get("workflow_runs"):
-            return "running"  # Default to running if no workflows exist
-
-        conclusion = data["workflow_runs"][0]["conclusion"]
-        if conclusion is None:
-            return "running"
-        elif conclusion == "success":
-            return "passed"
-        elif conclusion == "failure":
-            return "failed"
+        # Conditional request - a 304 does not count against the rate limit
+        etag = self.etag if self.etag and self.last_status is not None else None
+        token = None
+        try:
+            response = self._get_from_cache(url, etag)
+            if response is None:
+                token = self.token_pool.acquire(self.repo_owner)
+                headers = {"Authorization": f"Bearer {token.value}"}
+                if etag:
+                    headers["If-None-Match"] = etag
+                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        except (OSError, NoTokenError, TokenRefreshError) as e:
+            # requests.RequestException is an OSError, as are unreadable App keys
+            raise GitHubAPIError(f"Request to {url} failed: {e}") from e
+        if token is not None:
+            # Cached responses were fetched with the daemon's token, not ours
+            self._record_rate_limit(token, response.headers)
+
+        if response.status_code == 304:
+            return self.last_status
+        if response.status_code >= 400:
+            raise GitHubAPIError(f"GitHub API returned HTTP {response.status_code}")
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise GitHubAPIError("GitHub API returned a non-JSON body") from e
+        if not isinstance(data, dict):
+            raise GitHubAPIError("GitHub API returned an unexpected JSON body")
+        runs = data.get("workflow_runs") or []
+        if not isinstance(runs, list) or not all(isinstance(run, dict) for run in runs):
+            raise GitHubAPIError("GitHub API returned malformed workflow_runs")
+
+        # Use the newest run that the rules don't ignore; default to
+        # running if there are no (relevant) workflow runs
+        status = "running"
+        for run in runs:
+            run_status = self.status_rules.evaluate_run(run)
+            if run_status != IGNORE:
+                status = run_status
+                break
+
+        self.etag = response.headers.get("ETag")
+        self.last_status = status
+        return status
+
+    def _get_from_cache(self, url, etag):
+        """Return the response from the poll cache daemon, or None to poll directly.
+
+        No credentials are sent; the daemon polls with its own token.
+        """
+        if not self.poll_cache:
+            return None
+        try:
+            response = self.poll_cache.get(url, if_none_match=etag)
+        except PollCacheUnavailableError as e:
+            print(f"{e} - polling GitHub directly")
+            return None
+        if not (200 <= response.status_code < 300 or response.status_code == 304):
+            # The daemon's token may lack access to a repo that ours can read
+            print(f"Poll cache returned HTTP {response.status_code} - polling GitHub directly")
+            return None
+        return response
+
+    def _record_rate_limit(self, token, headers):
+        """Record the token's remaining budget from rate-limit headers."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        try:
+            remaining = int(remaining) if remaining is not None else None
+            reset = int(reset) if reset is not None else None
+        except ValueError as e:
+            raise GitHubAPIError(f"GitHub API returned a bad rate-limit header: {e}") from e
+        self.token_pool.record(token, remaining, reset)
+
+    def snapshot(self):
+        """Return validator and token budget state as a JSON-serializable dict."""
+        return {
+            "repo": f"{self.repo_owner}/{self.repo_name}",
+            "etag": self.etag,
+            "last_status": self.last_status,
+            "token_budgets": self.token_pool.snapshot(),
+        }
+
+    def restore(self, state):
+        """Restore state previously returned by snapshot().
+
+        Returns False and ignores the state if it was saved for a different
+        repository.
+        """
+        if state.get("repo") != f"{self.repo_owner}/{self.repo_name}":
+            return False
+        self.etag = state.get("etag")
+        self.last_status = state.get("last_status")
+        self.token_pool.restore(state.get("token_budgets") or {})
+        return True
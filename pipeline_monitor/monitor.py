@@ -1,22 +1,105 @@
+import time
+
+from pipeline_monitor.circuit_breaker import CircuitBreaker
+from pipeline_monitor.github_client import GitHubAPIError
+
+
 class PipelineMonitor:
-    def __init__(self, github_client, poll_interval=120):
+    def __init__(self, github_client, poll_interval=120, circuit_breaker=None,
+                 refresh_max_age=10, clock=time.monotonic):
         self.github_client = github_client
         self.poll_interval = poll_interval
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(clock=clock)
+        # refresh() serves the last status if it is younger than this
+        self.refresh_max_age = refresh_max_age
+        self.clock = clock
+        self.last_poll_at = None
+        self.next_poll_at = None
         self.callbacks = []
         self.previous_status = None
+        # Last status actually fetched from the API, served while stale
+        self.last_good_status = None
+        self.last_error = None
 
     def on_status_change(self, callback):
         self.callbacks.append(callback)
 
     def _poll_once(self):
-        current_status = self.github_client.get_pipeline_status()
+        current_status = self._fetch_status()
+        self.last_poll_at = self.clock()
+        self.next_poll_at = self.last_poll_at + self.poll_interval
 
         # Call callbacks on first poll OR when status changes
-        if self.previous_status is None or current_status != self.previous_status:
+        changed = self.previous_status is None or current_status != self.previous_status
+        self.previous_status = current_status
+
+        if changed:
             for callback in self.callbacks:
                 callback(current_status)
 
-        self.previous_status = current_status
+    def refresh(self, max_age=None):
+        """Poll now for an on-demand check and return the current status.
+
+        If the last poll is younger than max_age seconds (refresh_max_age by
+        default), the last status is returned without calling the API, so
+        bursts of manual checks cost at most one request. A real poll pushes
+        next_poll_at a full poll_interval into the future.
+        """
+        if max_age is None:
+            max_age = self.refresh_max_age
+        if self.last_poll_at is not None and self.clock() - self.last_poll_at < max_age:
+            return self.previous_status
+        self._poll_once()
+        return self.previous_status
+
+    def seconds_until_next_poll(self):
+        """Return how long until the next scheduled poll is due (0 if overdue)."""
+        if self.next_poll_at is None:
+            return 0
+        return max(0, self.next_poll_at - self.clock())
+
+    def _fetch_status(self):
+        """Fetch status through the circuit breaker.
+
+        While the circuit is closed, failures keep reporting the last good
+        status; once it opens, "stale" is reported until a probe succeeds.
+        """
+        if not self.circuit_breaker.allow_request():
+            return "stale"
+
+        try:
+            status = self.github_client.get_pipeline_status()
+        except GitHubAPIError as e:
+            self.last_error = str(e)
+            self.circuit_breaker.record_failure()
+            if self.circuit_breaker.state == CircuitBreaker.CLOSED and self.last_good_status:
+                return self.last_good_status
+            return "stale"
+        except Exception:
+            # Unexpected errors must still count, or a failed half-open
+            # probe would leave the circuit refusing requests for good
+            self.circuit_breaker.record_failure()
+            raise
+
+        self.circuit_breaker.record_success()
+        self.last_error = None
+        self.last_good_status = status
+        return status
+
+    def snapshot(self):
+        """Return monitor and client state for a warm restart."""
+        return {
+            "previous_status": self.previous_status,
+            "last_good_status": self.last_good_status,
+            "client": self.github_client.snapshot(),
+        }
+
+    def restore(self, state):
+        """Restore state previously returned by snapshot()."""
+        # Only trust the last status if the client accepted its state
+        if self.github_client.restore(state.get("client") or {}):
+            self.previous_status = state.get("previous_status")
+            self.last_good_status = state.get("last_good_status")
 
     def start(self):
         pass
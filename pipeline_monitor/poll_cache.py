@@ -0,0 +1,265 @@
+"""Shared poll cache daemon for several monitors on one host.
+
+Run one daemon per host, as its own user, with a token that can read the
+monitored repositories:
+
+    GITHUB_TOKEN=ghp_... python -m pipeline_monitor.poll_cache /run/pipeline-monitor/cache.sock
+
+and set "cache_socket" in each user's config.json. GitHubClient then asks the
+daemon for workflow runs over the Unix socket. Identical requests in flight
+are merged into one upstream request, and responses are reused for a short
+TTL, so the upstream load stays the same however many monitors run.
+
+Clients never send their own credentials; the daemon polls with its token
+and only serves /actions/runs listings. Before trusting a socket, clients
+check that its directory is not writable by other users and that the
+listening process belongs to the directory owner (or root), so another local
+user cannot impersonate the daemon. Responses are shared by everyone who can
+open the socket, which is created with mode 0660: grant access through a
+common group.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_SOCKET_PATH = "/run/pipeline-monitor/cache.sock"
+
+# Seconds before an upstream request is abandoned
+UPSTREAM_TIMEOUT = 10
+
+# The daemon polls with its own token, so it only serves run listings
+ALLOWED_URL_PREFIX = "https://api.github.com/repos/"
+ALLOWED_URL_SUFFIX = "/actions/runs"
+
+
+class PollCacheUnavailableError(Exception):
+    """Raised when the cache daemon cannot be reached or is not trusted."""
+
+
+class _Entry:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.fetched_at = None
+
+
+class PollCache:
+    """Merges identical in-flight GET requests and caches their responses."""
+
+    def __init__(self, token=None, ttl=30, fetch=requests.get, clock=time.monotonic,
+                 timeout=UPSTREAM_TIMEOUT):
+        self.token = token
+        self.ttl = ttl
+        self.fetch = fetch
+        self.clock = clock
+        self.timeout = timeout
+        self.upstream_requests = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+        # Last successful response per URL, revalidated with If-None-Match
+        self._last_good = {}
+
+    def get(self, url):
+        """Return a response dict with "status_code", "headers" and "body".
+
+        Upstream errors are returned as {"error": message} and not cached.
+        """
+        if not (url.startswith(ALLOWED_URL_PREFIX) and url.endswith(ALLOWED_URL_SUFFIX)):
+            return {"error": f"URL not served by the poll cache: {url}"}
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and not entry.done.is_set():
+                leader = False
+            elif entry is not None and entry.fetched_at is not None \
+                    and self.clock() - entry.fetched_at < self.ttl:
+                return entry.response
+            else:
+                entry = self._entries[url] = _Entry()
+                leader = True
+
+        if not leader:
+            entry.done.wait()
+            return entry.response
+
+        try:
+            entry.response = self._fetch_upstream(url, self._last_good.get(url))
+            if entry.response["status_code"] == 200:
+                entry.fetched_at = self.clock()
+                self._last_good[url] = entry.response
+        except requests.RequestException as e:
+            entry.response = {"error": str(e)}
+        finally:
+            entry.done.set()
+        return entry.response
+
+    def _fetch_upstream(self, url, previous):
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        etag = previous and previous["headers"].get("ETag")
+        if etag:
+            headers["If-None-Match"] = etag
+
+        self.upstream_requests += 1
+        response = self.fetch(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and previous:
+            return previous
+        # Rate-limit headers describe the daemon's token, not the clients'
+        response_headers = CaseInsensitiveDict(
+            (k, v) for k, v in response.headers.items()
+            if not k.lower().startswith("x-ratelimit-")
+        )
+        return {
+            "status_code": response.status_code,
+            "headers": response_headers,
+            "body": response.text,
+        }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return  # Client hung up, e.g. after refusing to trust the socket
+        request = json.loads(line)
+        response = self.server.cache.get(request["url"])
+
+        if "error" not in response:
+            # Answer the client's own conditional request without a body
+            etag = response["headers"].get("ETag")
+            not_modified = response["status_code"] == 200 and etag \
+                and request.get("if_none_match") == etag
+            response = {
+                "status_code": 304 if not_modified else response["status_code"],
+                "headers": dict(response["headers"]),
+                "body": "" if not_modified else response["body"],
+            }
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class PollCacheServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server in front of a PollCache."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, cache=None):
+        self.socket_path = Path(socket_path)
+        self.cache = cache or PollCache()
+        self.socket_path.parent.mkdir(mode=0o755, parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        super().__init__(str(self.socket_path), _Handler)
+        self.socket_path.chmod(0o660)
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class CachedResponse:
+    """Minimal requests.Response look-alike for responses from the daemon."""
+
+    def __init__(self, data):
+        self.status_code = data["status_code"]
+        self.headers = CaseInsensitiveDict(data["headers"])
+        self.text = data["body"]
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class PollCacheClient:
+    """Fetches workflow runs through the cache daemon."""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, timeout=UPSTREAM_TIMEOUT + 5):
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+
+    def get(self, url, if_none_match=None):
+        """Return a CachedResponse for url.
+
+        Raises PollCacheUnavailableError if the daemon is not running, the
+        socket cannot be trusted, or the daemon could not answer.
+        """
+        request = json.dumps({"url": url, "if_none_match": if_none_match}).encode() + b"\n"
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(str(self.socket_path))
+                self._verify_daemon(sock)
+                sock.sendall(request)
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except OSError as e:
+            raise PollCacheUnavailableError(f"Poll cache at {self.socket_path} unavailable: {e}") from e
+        if not line:
+            raise PollCacheUnavailableError(f"Poll cache at {self.socket_path} closed the connection")
+
+        try:
+            data = json.loads(line)
+            if "error" in data:
+                raise PollCacheUnavailableError(f"Poll cache at {self.socket_path} failed: {data['error']}")
+            return CachedResponse(data)
+        except (ValueError, TypeError, KeyError) as e:
+            raise PollCacheUnavailableError(
+                f"Poll cache at {self.socket_path} sent a malformed reply: {e}"
+            ) from e
+
+    def _verify_daemon(self, sock):
+        """Refuse sockets another local user could have put in place."""
+        directory = self.socket_path.parent
+        dir_stat = directory.stat()
+        if dir_stat.st_mode & 0o022:
+            raise PollCacheUnavailableError(
+                f"{directory} is writable by other users; not trusting {self.socket_path}"
+            )
+        peer_uid = _peer_uid(sock, self.socket_path)
+        if peer_uid not in (0, os.getuid(), dir_stat.st_uid):
+            raise PollCacheUnavailableError(
+                f"{self.socket_path} is served by uid {peer_uid}, not the owner of {directory}"
+            )
+
+
+def _peer_uid(sock, socket_path):
+    """Return the uid of the process listening on a connected Unix socket."""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return uid
+    # No peer credentials on this platform; the socket owner is the next best
+    return socket_path.stat().st_uid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared poll cache for Pipeline Monitor")
+    parser.add_argument("socket_path", nargs="?", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--ttl", type=float, default=30, help="Seconds to reuse a response")
+    parser.add_argument("--token-file", help="File containing the GitHub token (default: $GITHUB_TOKEN)")
+    args = parser.parse_args()
+
+    token = Path(args.token_file).read_text().strip() if args.token_file else os.environ.get("GITHUB_TOKEN")
+    if not token:
+        print("A GitHub token is required: set GITHUB_TOKEN or pass --token-file")
+        sys.exit(1)
+
+    with PollCacheServer(args.socket_path, PollCache(token=token, ttl=args.ttl)) as server:
+        print(f"Poll cache listening on {args.socket_path}")
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,178 @@
+import copy
 import json
+from pathlib import Path
+
+from pipeline_monitor.fileutil import atomic_write_text
+
+CONFIG_VERSION = 2
+
+# Keys stored in the secrets file next to config.json instead of in it
+SECRET_KEYS = ("api_token", "api_tokens")
+
+# key -> (accepted types, required)
+SCHEMA = {
+    "version": ((int,), False),
+    "github_repo_url": ((str,), True),
+    "api_token": ((str, type(None)), False),
+    "poll_interval_seconds": ((int,), True),
+    "enable_notifications": ((bool,), False),
+    "status_rules": ((list,), False),
+    "api_tokens": ((list,), False),
+    "cache_socket": ((str, type(None)), False),
+    "feed_port": ((int, type(None)), False),
+}
+
+
+class SettingsError(ValueError):
+    """Raised when a config file is invalid."""
+
+
+def _migrate_v1(data):
+    # Version 1 configs had no version key and optional notifications
+    data.setdefault("enable_notifications", True)
+    return data
+
+
+# version -> function migrating a config of that version to the next one
+MIGRATIONS = {1: _migrate_v1}
+
+
+def _validate(data):
+    unknown = set(data) - set(SCHEMA)
+    if unknown:
+        raise SettingsError(f"Unknown settings: {', '.join(sorted(unknown))}")
+    for key, (types, required) in SCHEMA.items():
+        if key not in data:
+            if required:
+                raise SettingsError(f"Missing required setting: {key}")
+            continue
+        value = data[key]
+        # bool is a subclass of int, but not a valid interval
+        if not isinstance(value, types) or (bool not in types and isinstance(value, bool)):
+            expected = " or ".join(t.__name__ for t in types)
+            raise SettingsError(f"Setting {key} must be {expected}, got {type(value).__name__}")
+    if not data.get("api_token") and not data.get("api_tokens"):
+        raise SettingsError("Setting api_token or api_tokens is required")
+    if data["poll_interval_seconds"] <= 0:
+        raise SettingsError("Setting poll_interval_seconds must be positive")
+    feed_port = data.get("feed_port")
+    if feed_port is not None and not 1 <= feed_port <= 65535:
+        raise SettingsError("Setting feed_port must be between 1 and 65535")
+    if not all(isinstance(rule, dict) for rule in data.get("status_rules", [])):
+        raise SettingsError("Setting status_rules must be a list of objects")
+    for entry in data.get("api_tokens", []):
+        if not _is_token_entry(entry):
+            raise SettingsError(
+                "Setting api_tokens entries must be token strings, "
+                '{"token", "owner"} objects or {"app_id", "installation_id", '
+                '"private_key_path", "owner"} objects'
+            )
+
+
+def _is_token_entry(entry):
+    if isinstance(entry, str):
+        return True
+    if not isinstance(entry, dict) or not isinstance(entry.get("owner", ""), str):
+        return False
+    if set(entry) <= {"token", "owner"}:
+        return isinstance(entry.get("token"), str)
+    app_keys = {"app_id", "installation_id", "private_key_path"}
+    return app_keys <= set(entry) <= app_keys | {"owner"} \
+        and isinstance(entry["private_key_path"], str)
+
+
+def secrets_path(file_path):
+    """Return the path of the secrets file belonging to a config file."""
+    return Path(file_path).with_suffix(".secrets.json")
 
 
 class Settings:
-    def __init__(self, github_repo_url, api_token, poll_interval_seconds, enable_notifications=True):
+    # Parsed configs keyed by path, reused while the files are unchanged
+    _cache = {}
+
+    def __init__(self, github_repo_url, api_token, poll_interval_seconds, enable_notifications=True,
+                 status_rules=None, api_tokens=None, cache_socket=None, feed_port=None):
         self.github_repo_url = github_repo_url
         self.api_token = api_token
         self.poll_interval_seconds = poll_interval_seconds
         self.enable_notifications = enable_notifications
+        # Extra rules for StatusRules, applied on top of the built-in defaults
+        self.status_rules = status_rules or []
+        # Additional tokens for TokenPool (strings, owner-scoped or GitHub App entries)
+        self.api_tokens = api_tokens or []
+        # Unix socket of a shared poll cache daemon (see poll_cache.py)
+        self.cache_socket = cache_socket
+        # Local port for the status feed (see status_feed.py); None disables it
+        self.feed_port = feed_port
 
     def save(self, file_path):
+        """Save settings atomically, keeping tokens in a separate 0600 file."""
         data = {
+            "version": CONFIG_VERSION,
             "github_repo_url": self.github_repo_url,
-            "api_token": self.api_token,
             "poll_interval_seconds": self.poll_interval_seconds,
-            "enable_notifications": self.enable_notifications
+            "enable_notifications": self.enable_notifications,
+            "status_rules": self.status_rules,
+            "cache_socket": self.cache_socket,
+            "feed_port": self.feed_port
         }
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        secrets = {key: getattr(self, key) for key in SECRET_KEYS}
+        atomic_write_text(secrets_path(file_path), json.dumps(secrets, indent=2), mode=0o600)
+        atomic_write_text(file_path, json.dumps(data, indent=2))
 
     @classmethod
     def load(cls, file_path):
-        with open(file_path, 'r') as f:
+        """Load, migrate and validate settings.
+
+        Raises SettingsError if the config is not valid JSON or does not
+        match SCHEMA. Parsed configs are cached by file mtime, so repeated
+        loads of an unchanged config skip parsing and validation.
+        """
+        file_path = Path(file_path)
+        secrets_file = secrets_path(file_path)
+        key = str(file_path.resolve())
+        stamp = (_file_stamp(file_path), _file_stamp(secrets_file))
+
+        cached = cls._cache.get(key)
+        if cached is None or cached[0] != stamp:
+            data = _read_json(file_path)
+            if secrets_file.exists():
+                # Tokens edited into config.json by hand win over saved ones;
+                # the next save moves them to the secrets file
+                data = {**_read_json(secrets_file), **data}
+
+            version = data.pop("version", 1)
+            if not isinstance(version, int) or not 1 <= version <= CONFIG_VERSION:
+                raise SettingsError(f"Unsupported config version: {version}")
+            while version < CONFIG_VERSION:
+                data = MIGRATIONS[version](data)
+                version += 1
+
+            _validate(data)
+            data.setdefault("api_token", None)
+            cached = (stamp, data)
+            cls._cache[key] = cached
+
+        return cls(**copy.deepcopy(cached[1]))
+
+
+def _file_stamp(file_path):
+    try:
+        stat = Path(file_path).stat()
+    except FileNotFoundError:
+        return None
+    # Atomic saves replace the inode, so this changes even on coarse mtimes
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _read_json(file_path):
+    try:
+        with Path(file_path).open() as f:
             data = json.load(f)
-        # Backward compatibility - default to True if not present
-        if "enable_notifications" not in data:
-            data["enable_notifications"] = True
-        return cls(**data)
+    except OSError as e:
+        raise SettingsError(f"Cannot read {file_path}: {e}") from e
+    except ValueError as e:
+        raise SettingsError(f"{file_path} is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise SettingsError(f"{file_path} must contain a JSON object")
+    return data
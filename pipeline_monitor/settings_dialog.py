@@ -46,7 +46,7 @@ class SettingsDialog(Gtk.Dialog):
         box.pack_start(label_token, False, False, 0)
 
         self.entry_token = Gtk.Entry()
-        self.entry_token.set_text(current_settings.api_token)
+        self.entry_token.set_text(current_settings.api_token or "")
         self.entry_token.set_placeholder_text("ghp_xxxxxxxxxxxx")
         self.entry_token.set_visibility(False)  # Hide token
         self.entry_token.set_input_purpose(Gtk.InputPurpose.PASSWORD)
@@ -81,5 +81,9 @@ class SettingsDialog(Gtk.Dialog):
             github_repo_url=self.entry_repo.get_text().strip(),
             api_token=self.entry_token.get_text().strip(),
             poll_interval_seconds=int(self.spin_interval.get_value()),
-            enable_notifications=self.check_notifications.get_active()
+            enable_notifications=self.check_notifications.get_active(),
+            status_rules=self.current_settings.status_rules,
+            api_tokens=self.current_settings.api_tokens,
+            cache_socket=self.current_settings.cache_socket,
+            feed_port=self.current_settings.feed_port
         )
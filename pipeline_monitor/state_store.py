@@ -0,0 +1,45 @@
+"""Persistent snapshot of monitor state for warm starts."""
+
+import json
+from pathlib import Path
+
+from pipeline_monitor.fileutil import atomic_write_text
+
+
+class StateStore:
+    """Reads and atomically writes a compact JSON snapshot of monitor state."""
+
+    VERSION = 1
+
+    def __init__(self, file_path):
+        self.file_path = Path(file_path)
+        self._last_written = None
+
+    def load(self):
+        """Return the saved state, or None if missing, unreadable or outdated."""
+        try:
+            data = json.loads(self.file_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return None
+        self._last_written = json.dumps(data, separators=(",", ":"), sort_keys=True)
+        return data.get("state")
+
+    def save(self, state):
+        """Write state if it changed since the last save or load.
+
+        The snapshot is written to a temporary file and renamed over the old
+        one, so a crash mid-write never leaves a truncated file behind.
+        """
+        payload = json.dumps(
+            {"version": self.VERSION, "state": state},
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+        if payload == self._last_written:
+            return False
+
+        atomic_write_text(self.file_path, payload, mode=0o600)
+        self._last_written = payload
+        return True
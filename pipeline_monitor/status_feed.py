@@ -0,0 +1,231 @@
+"""Streaming status feed for dashboards and bots.
+
+StatusFeed records every status change with an increasing event id. With a
+history_file the history is appended to a newline-delimited JSON file and
+reloaded on start, so it survives restarts and ids keep increasing. Pass the
+last id of the previous run as last_id to keep ids increasing even if the
+file is lost, so clients never mistake new events for ones they have seen.
+StatusFeedServer publishes the feed on a local port:
+
+- GET /events    Server-Sent Events stream of status changes, with a compact
+                 snapshot event whenever nothing changed for snapshot_interval
+                 seconds. Clients resume with the Last-Event-ID header (sent
+                 automatically by EventSource) or ?last_event_id=N.
+- GET /snapshot  Latest status as JSON.
+- GET /history   Recorded history as newline-delimited JSON.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from pipeline_monitor.fileutil import atomic_write_text
+
+
+class StatusFeed:
+    """Thread-safe, bounded history of status change events."""
+
+    def __init__(self, repo, history_size=10000, clock=time.time, last_id=0, history_file=None):
+        self.repo = repo
+        self.clock = clock
+        self.history = deque(maxlen=history_size)
+        self.last_id = last_id
+        # Latest status, also set by seed() without recording an event
+        self.status = None
+        self.closed = False
+        self.history_file = Path(history_file) if history_file else None
+        self._file_lines = 0
+        self._condition = threading.Condition()
+        if self.history_file:
+            self._load_history()
+
+    def _load_history(self):
+        try:
+            lines = self.history_file.read_text().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Partly written line from a crash
+            if isinstance(event, dict) and isinstance(event.get("id"), int) and "status" in event:
+                self.history.append(event)
+        self._file_lines = len(lines)
+        if self.history:
+            self.last_id = max(self.last_id, self.history[-1]["id"])
+            self.status = self.history[-1]["status"]
+
+    def seed(self, status):
+        """Set the current status without recording a change event.
+
+        Used for a status restored at startup, so clients see it in
+        snapshots but nothing is announced as a change.
+        """
+        with self._condition:
+            self.status = status
+
+    def publish(self, status):
+        """Record a status change and wake up streaming clients."""
+        with self._condition:
+            self.last_id += 1
+            event = {
+                "id": self.last_id,
+                "time": self.clock(),
+                "repo": self.repo,
+                "status": status,
+            }
+            self.history.append(event)
+            self.status = status
+            self._append_to_file(event)
+            self._condition.notify_all()
+        return event
+
+    def _append_to_file(self, event):
+        if not self.history_file:
+            return
+        try:
+            # Rewrite the file once it holds twice the history, so it stays bounded
+            if self._file_lines >= 2 * self.history.maxlen:
+                self._file_lines = self.export_ndjson(self.history_file)
+                return
+            with self.history_file.open("a") as f:
+                f.write(json.dumps(event) + "\n")
+        except OSError as e:
+            print(f"Could not write status history to {self.history_file}: {e}")
+            return
+        self._file_lines += 1
+
+    def events(self):
+        """Return a copy of the recorded history."""
+        with self._condition:
+            return list(self.history)
+
+    def snapshot(self):
+        """Return the latest status in compact form."""
+        with self._condition:
+            return {
+                "id": self.last_id,
+                "time": self.clock(),
+                "repo": self.repo,
+                "status": self.status,
+            }
+
+    def events_since(self, last_id):
+        """Return events newer than last_id.
+
+        Returns None if events after last_id have already been dropped from
+        the history, in which case the client should start from a snapshot.
+        """
+        with self._condition:
+            if self.history and last_id < self.history[0]["id"] - 1:
+                return None
+            return [event for event in self.history if event["id"] > last_id]
+
+    def wait(self, last_id, timeout):
+        """Block until an event newer than last_id exists or timeout passes."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.last_id > last_id or self.closed, timeout)
+
+    def close(self):
+        """Stop all streaming clients."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def export_ndjson(self, file_path):
+        """Atomically write the history as newline-delimited JSON.
+
+        Returns the number of events written.
+        """
+        with self._condition:
+            events = list(self.history)
+        atomic_write_text(file_path, "".join(json.dumps(event) + "\n" for event in events))
+        return len(events)
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/events":
+            self._stream_events(parse_qs(url.query))
+        elif url.path == "/snapshot":
+            self._send_body("application/json", json.dumps(self.server.feed.snapshot()) + "\n")
+        elif url.path == "/history":
+            events = self.server.feed.events()
+            body = "".join(json.dumps(event) + "\n" for event in events)
+            self._send_body("application/x-ndjson", body)
+        else:
+            self.send_error(404)
+
+    def _send_body(self, content_type, body):
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self, query):
+        feed = self.server.feed
+        last_id = self.headers.get("Last-Event-ID") or query.get("last_event_id", [None])[0]
+        try:
+            last_id = int(last_id) if last_id is not None else None
+        except ValueError:
+            last_id = None
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        try:
+            events = feed.events_since(last_id) if last_id is not None else None
+            while not feed.closed:
+                if not events:
+                    # New clients, clients too far behind to resume, and quiet
+                    # periods all get a compact snapshot of the current status
+                    snapshot = feed.snapshot()
+                    self._write_event("snapshot", snapshot)
+                    last_id = snapshot["id"]
+                for event in events or []:
+                    self._write_event("status", event)
+                    last_id = event["id"]
+                feed.wait(last_id, self.server.snapshot_interval)
+                events = feed.events_since(last_id)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+
+    def _write_event(self, event_type, data):
+        message = f"id: {data['id']}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+        self.wfile.write(message.encode())
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass  # Keep the app's console output readable
+
+
+class StatusFeedServer(ThreadingHTTPServer):
+    """HTTP server publishing a StatusFeed on a local port."""
+
+    daemon_threads = True
+
+    def __init__(self, feed, port=8765, host="127.0.0.1", snapshot_interval=60):
+        self.feed = feed
+        self.snapshot_interval = snapshot_interval
+        super().__init__((host, port), _FeedHandler)
+
+    def start(self):
+        """Serve in a background thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.feed.close()
+        self.shutdown()
+        self.server_close()
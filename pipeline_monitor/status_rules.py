@@ -0,0 +1,104 @@
+"""Data-driven mapping of workflow runs to pipeline status."""
+
+WILDCARD = "*"
+
+# Status for runs that should not affect the displayed status; the next
+# older run is considered instead.
+IGNORE = "ignore"
+
+# Statuses a rule may map a run to
+STATUSES = frozenset({"passed", "failed", "running", IGNORE})
+
+# Built-in rules covering every GitHub Actions conclusion. A null
+# conclusion means the run has not completed yet.
+DEFAULT_RULES = [
+    {"conclusion": None, "status": "running"},
+    {"conclusion": "success", "status": "passed"},
+    {"conclusion": "neutral", "status": "passed"},
+    {"conclusion": "failure", "status": "failed"},
+    {"conclusion": "timed_out", "status": "failed"},
+    {"conclusion": "startup_failure", "status": "failed"},
+    {"conclusion": "action_required", "status": "failed"},
+    {"conclusion": "cancelled", "status": IGNORE},
+    {"conclusion": "skipped", "status": IGNORE},
+    {"conclusion": "stale", "status": IGNORE},
+]
+
+
+class StatusRules:
+    """Compiled set of rules mapping a workflow run to a status.
+
+    Each rule is a dict with optional "workflow", "branch", "event" and
+    "conclusion" keys (missing keys or "*" match anything), a required
+    "status" and an optional integer "priority" (default 0). When several rules
+    match, the highest priority wins, then the more specific rule, then
+    the rule defined last. User rules are added after DEFAULT_RULES, so
+    they override the defaults on ties.
+
+    Rules are compiled into one hash table per combination of fields they
+    constrain, so evaluating a run costs a handful of dict lookups no matter
+    how many rules are configured. Results are memoized per distinct run
+    key.
+    """
+
+    FIELDS = ("workflow", "branch", "event", "conclusion")
+    CACHE_SIZE = 4096
+
+    def __init__(self, rules=None, default_status="running"):
+        self.rules = DEFAULT_RULES + list(rules or [])
+        self.default_status = default_status
+        self._tables = {}
+        self._cache = {}
+
+        for order, rule in enumerate(self.rules):
+            unknown = set(rule) - set(self.FIELDS) - {"status", "priority"}
+            if unknown:
+                raise ValueError(f"Unknown status rule keys: {sorted(unknown)}")
+            if "status" not in rule:
+                raise ValueError(f"Status rule is missing 'status': {rule}")
+            if rule["status"] not in STATUSES:
+                raise ValueError(
+                    f"Invalid status {rule['status']!r} in status rule; "
+                    f"expected one of {sorted(STATUSES)}"
+                )
+
+            key = tuple(rule.get(field, WILDCARD) for field in self.FIELDS)
+            mask = tuple(value != WILDCARD for value in key)
+            rank = (int(rule.get("priority", 0)), sum(mask), order)
+            table = self._tables.setdefault(mask, {})
+            if key not in table or rank > table[key][0]:
+                table[key] = (rank, rule["status"])
+
+        self._masks = list(self._tables)
+
+    def evaluate(self, workflow, branch, event, conclusion):
+        """Return the status for a single run."""
+        run_key = (workflow, branch, event, conclusion)
+        status = self._cache.get(run_key)
+        if status is not None:
+            return status
+
+        best = None
+        for mask in self._masks:
+            key = tuple(
+                value if specified else WILDCARD
+                for value, specified in zip(run_key, mask, strict=True)
+            )
+            match = self._tables[mask].get(key)
+            if match is not None and (best is None or match[0] > best[0]):
+                best = match
+        status = best[1] if best else self.default_status
+
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[run_key] = status
+        return status
+
+    def evaluate_run(self, run):
+        """Return the status for a workflow run dict from the GitHub API."""
+        return self.evaluate(
+            run.get("name"),
+            run.get("head_branch"),
+            run.get("event"),
+            run.get("conclusion"),
+        )
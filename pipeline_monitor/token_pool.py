@@ -0,0 +1,180 @@
+"""Pool of GitHub API tokens with rate-limit aware rotation."""
+
+import hashlib
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+# Seconds before a token request is abandoned; refreshes run on the GTK main loop
+REQUEST_TIMEOUT = 10
+
+
+class Token:
+    """A single API credential and its last known rate-limit budget."""
+
+    def __init__(self, value, owner=None, expires_at=None, refresh=None, key=None):
+        self.value = value
+        # Stable identifier used to persist budgets without storing the secret
+        self.key = key or hashlib.sha256((value or "").encode()).hexdigest()[:16]
+        # Only use this token for repos of this owner (None = any owner)
+        self.owner = owner
+        # Epoch seconds; set for short-lived GitHub App installation tokens
+        self.expires_at = expires_at
+        # Callable returning (value, expires_at) for a new token; raises
+        # TokenRefreshError on failure
+        self.refresh = refresh
+        self.remaining = None
+        self.reset_at = None
+
+
+class NoTokenError(Exception):
+    """Raised when no token in the pool may be used for a repository."""
+
+
+class TokenRefreshError(Exception):
+    """Raised when a short-lived token cannot be refreshed."""
+
+
+class TokenPool:
+    """Picks the token with the most remaining rate-limit budget per request."""
+
+    # Refresh expiring tokens this many seconds ahead of time
+    REFRESH_MARGIN = 300
+
+    def __init__(self, tokens, clock=time.time):
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self.tokens = list(tokens)
+        self.clock = clock
+
+    @classmethod
+    def from_config(cls, entries):
+        """Build a pool from config entries.
+
+        Each entry is either a token string, a dict with "token" and an
+        optional "owner", or a GitHub App installation dict with "app_id",
+        "installation_id", "private_key_path" and an optional "owner".
+        """
+        tokens = []
+        for entry in entries:
+            if isinstance(entry, str):
+                tokens.append(Token(entry))
+            elif "token" in entry:
+                tokens.append(Token(entry["token"], owner=entry.get("owner")))
+            elif {"app_id", "installation_id", "private_key_path"} <= set(entry):
+                _require_jwt()
+                refresh = github_app_token_refresher(
+                    entry["app_id"], entry["installation_id"], entry["private_key_path"]
+                )
+                key = f"app:{entry['app_id']}:{entry['installation_id']}"
+                tokens.append(Token(None, owner=entry.get("owner"), expires_at=0,
+                                    refresh=refresh, key=key))
+            else:
+                raise ValueError(f"Invalid token entry: {sorted(entry)}")
+        return cls(tokens)
+
+    def acquire(self, owner=None):
+        """Return the best token for a request to a repo of the given owner.
+
+        Tokens scoped to the owner are preferred, then unscoped tokens.
+        Tokens scoped to other owners are never used; NoTokenError is raised
+        if nothing else is available.
+        """
+        now = self.clock()
+        scoped = [t for t in self.tokens if t.owner == owner] if owner else []
+        candidates = scoped or [t for t in self.tokens if t.owner is None]
+        if not candidates:
+            raise NoTokenError(f"No API token configured for owner {owner!r}")
+
+        token = max(candidates, key=lambda t: self._budget(t, now))
+        if token.refresh and (token.expires_at is None or token.expires_at - now < self.REFRESH_MARGIN):
+            token.value, token.expires_at = token.refresh()
+            token.remaining = None
+            token.reset_at = None
+        return token
+
+    def record(self, token, remaining, reset_at):
+        """Record rate-limit headers from a response made with token."""
+        if remaining is not None:
+            token.remaining = remaining
+        if reset_at is not None:
+            token.reset_at = reset_at
+
+    def has_token_for(self, owner):
+        """Return True if acquire(owner) can find a token."""
+        return any(t.owner in (owner, None) for t in self.tokens)
+
+    def snapshot(self):
+        """Return per-token budgets keyed by token key (no secrets)."""
+        return {
+            t.key: {"remaining": t.remaining, "reset_at": t.reset_at}
+            for t in self.tokens
+        }
+
+    def restore(self, state):
+        """Restore budgets previously returned by snapshot()."""
+        for token in self.tokens:
+            budget = state.get(token.key)
+            if budget:
+                token.remaining = budget.get("remaining")
+                token.reset_at = budget.get("reset_at")
+
+    @staticmethod
+    def _budget(token, now):
+        # Unknown or already reset budgets are assumed to be full
+        if token.remaining is None or (token.reset_at is not None and token.reset_at <= now):
+            return float("inf")
+        return token.remaining
+
+
+def _require_jwt():
+    try:
+        import jwt  # noqa: F401
+    except ImportError as e:
+        raise ValueError(
+            "GitHub App tokens require PyJWT: pip install 'pyjwt[crypto]'"
+        ) from e
+
+
+def github_app_token_refresher(app_id, installation_id, private_key_path):
+    """Return a callable that mints a GitHub App installation token.
+
+    The callable raises TokenRefreshError whatever went wrong, whether the
+    key, the JWT library, the request or the response.
+    """
+
+    def refresh():
+        try:
+            return _mint()
+        except Exception as e:
+            raise TokenRefreshError(
+                f"Could not refresh GitHub App token for installation {installation_id}: {e}"
+            ) from e
+
+    def _mint():
+        import jwt
+
+        now = int(time.time())
+        private_key = Path(private_key_path).read_text()
+        # GitHub allows app JWTs to live at most 10 minutes
+        app_jwt = jwt.encode(
+            {"iat": now - 60, "exp": now + 540, "iss": str(app_id)},
+            private_key,
+            algorithm="RS256",
+        )
+        response = requests.post(
+            f"https://api.github.com/app/installations/{installation_id}/access_tokens",
+            headers={
+                "Authorization": f"Bearer {app_jwt}",
+                "Accept": "application/vnd.github+json",
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = response.json()
+        expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00"))
+        return data["token"], expires_at.timestamp()
+
+    return refresh
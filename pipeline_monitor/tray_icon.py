@@ -24,7 +24,8 @@ class TrayIcon:
             icon_map = {
                 "failed": str(self.icons_dir / "pipeline-red.svg"),
                 "running": str(self.icons_dir / "pipeline-yellow.svg"),
-                "passed": str(self.icons_dir / "pipeline-green.svg")
+                "passed": str(self.icons_dir / "pipeline-green.svg"),
+                "stale": str(self.icons_dir / "pipeline-grey.svg")
             }
             self.icon_name = icon_map.get(status, "application-default-icon")
         else:
@@ -32,7 +33,8 @@ class TrayIcon:
             icon_map = {
                 "failed": "dialog-error",
                 "running": "dialog-warning",
-                "passed": "dialog-ok"
+                "passed": "dialog-ok",
+                "stale": "dialog-question"
             }
             self.icon_name = icon_map.get(status, "application-default-icon")
 
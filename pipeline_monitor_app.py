@@ -16,10 +16,17 @@ gi.require_version("AppIndicator3", "0.1")
 from gi.repository import Gtk, AppIndicator3, GLib
 
 from pipeline_monitor.tray_icon import TrayIcon
-from pipeline_monitor.settings import Settings
+from pipeline_monitor.settings import Settings, SettingsError
 from pipeline_monitor.github_client import GitHubClient
 from pipeline_monitor.monitor import PipelineMonitor
 from pipeline_monitor.settings_dialog import SettingsDialog
+from pipeline_monitor.state_store import StateStore
+from pipeline_monitor.status_feed import StatusFeed, StatusFeedServer
+from pipeline_monitor.status_rules import StatusRules
+from pipeline_monitor.token_pool import TokenPool
+
+# Repeat clicks on "Check Now" within this window after a check are ignored
+CHECK_NOW_DEBOUNCE_MS = 300
 
 
 class PipelineMonitorApp:
@@ -31,7 +38,11 @@ class PipelineMonitorApp:
 
         # Load settings
         if self.config_path.exists():
-            self.settings = Settings.load(str(self.config_path))
+            try:
+                self.settings = Settings.load(str(self.config_path))
+            except SettingsError as e:
+                print(f"Invalid config file {self.config_path}: {e}")
+                sys.exit(1)
             print(f"Loaded settings from {self.config_path}")
         else:
             print(f"Config file not found: {self.config_path}")
@@ -51,6 +62,22 @@ class PipelineMonitorApp:
 
         repo_owner, repo_name = repo_parts
 
+        try:
+            status_rules = StatusRules(self.settings.status_rules)
+        except (ValueError, TypeError) as e:
+            print(f"Invalid status_rules in {self.config_path}: {e}")
+            sys.exit(1)
+
+        token_entries = [self.settings.api_token] if self.settings.api_token else []
+        try:
+            token_pool = TokenPool.from_config(token_entries + self.settings.api_tokens)
+        except (ValueError, TypeError) as e:
+            print(f"Invalid api_token/api_tokens in {self.config_path}: {e}")
+            sys.exit(1)
+        if not token_pool.has_token_for(repo_owner):
+            print(f"No api_token or api_tokens entry can be used for {repo_owner}")
+            sys.exit(1)
+
         # Determine icons directory
         icons_dir = Path(__file__).parent / "icons"
 
@@ -66,7 +93,9 @@ class PipelineMonitorApp:
         self.github_client = GitHubClient(
             repo_owner=repo_owner,
             repo_name=repo_name,
-            api_token=self.settings.api_token
+            api_token=token_pool,
+            status_rules=status_rules,
+            cache_socket=self.settings.cache_socket
         )
 
         self.monitor = PipelineMonitor(
@@ -74,6 +103,15 @@ class PipelineMonitorApp:
             poll_interval=self.settings.poll_interval_seconds
         )
 
+        # Restore last known state so the tray is useful before the first poll
+        self.state_store = StateStore(self.config_path.with_name("state.json"))
+        saved_state = self.state_store.load() or {}
+        if saved_state:
+            self.monitor.restore(saved_state)
+        # Status feed event ids continue from the previous run
+        feed_last_id = saved_state.get("feed_last_id")
+        self.feed_last_id = feed_last_id if isinstance(feed_last_id, int) else 0
+
         # Setup AppIndicator
         self.indicator = AppIndicator3.Indicator.new(
             "pipeline-monitor",
@@ -120,17 +158,45 @@ class PipelineMonitorApp:
         menu.show_all()
         self.indicator.set_menu(menu)
 
+        # Show the restored status immediately
+        if self.monitor.previous_status:
+            self.show_status(self.monitor.previous_status)
+
         # Register for status changes
         self.monitor.on_status_change(self.on_status_changed)
 
+        # Publish status changes to dashboards and bots (if enabled)
+        self.feed = None
+        self.feed_server = None
+        if self.settings.feed_port:
+            feed = StatusFeed(
+                self.settings.github_repo_url,
+                last_id=self.feed_last_id,
+                history_file=self.config_path.with_name("history.ndjson"),
+            )
+            # The restored status is current, but not a change to announce
+            if self.monitor.previous_status:
+                feed.seed(self.monitor.previous_status)
+            try:
+                self.feed_server = StatusFeedServer(feed, port=self.settings.feed_port)
+            except OSError as e:
+                print(f"Could not start status feed on port {self.settings.feed_port}: {e}")
+            else:
+                self.feed = feed
+                self.monitor.on_status_change(feed.publish)
+                self.feed_server.start()
+                print(f"Status feed: http://127.0.0.1:{self.settings.feed_port}/events")
+
         # Start polling in background using GLib timeout
-        GLib.timeout_add_seconds(
+        self.poll_source_id = GLib.timeout_add_seconds(
             self.settings.poll_interval_seconds,
             self.poll_status
         )
+        self.check_now_source_id = None
 
-        # Do initial poll
-        self.poll_status()
+        # Do initial poll once the main loop is running, so the restored
+        # status is drawn before the first (blocking) request
+        GLib.idle_add(self.initial_poll)
 
         print(f"Monitoring: {self.settings.github_repo_url}")
         print(f"Poll interval: {self.settings.poll_interval_seconds}s")
@@ -139,28 +205,56 @@ class PipelineMonitorApp:
     def poll_status(self) -> bool:
         """Poll status once. Returns True to continue GLib timeout."""
         self.monitor._poll_once()
+        self.save_state()
         return True  # Continue polling
 
+    def save_state(self) -> None:
+        """Save monitor state and the last feed event id for a warm start."""
+        state = self.monitor.snapshot()
+        if self.feed:
+            self.feed_last_id = self.feed.last_id
+        state["feed_last_id"] = self.feed_last_id
+        self.state_store.save(state)
+
+    def initial_poll(self) -> bool:
+        """Run the first poll. Returns False so the idle source runs once."""
+        self.poll_status()
+        return False
+
     def on_status_changed(self, new_status: str) -> None:
         """Handle status change from monitor."""
         print(f"Status changed to: {new_status}")
+        if new_status == "stale" and self.monitor.last_error:
+            print(f"GitHub API unavailable: {self.monitor.last_error}")
+
+        status_text = self.show_status(new_status)
 
+        # Show desktop notification (if enabled)
+        if self.settings.enable_notifications:
+            self.show_notification(new_status, status_text)
+
+    def show_status(self, status: str) -> str:
+        """Update tray icon and status menu item. Returns the status label."""
         # Update tray icon
-        self.tray_icon.update_status(new_status)
+        self.tray_icon.update_status(status)
         self.indicator.set_icon(self.tray_icon.icon_name)
 
         # Update menu item
-        status_text = {
+        status_labels = {
             "passed": "✓ Passed",
             "failed": "✗ Failed",
-            "running": "⟳ Running"
-        }.get(new_status, new_status)
+            "running": "⟳ Running",
+            "stale": "? Unknown"
+        }
+        status_text = status_labels.get(status, status)
 
-        self.status_item.set_label(f"Status: {status_text}")
+        # While GitHub is unreachable, keep showing the last good status
+        last_good = self.monitor.last_good_status
+        if status == "stale" and last_good:
+            status_text = f"{status_labels.get(last_good, last_good)} (stale)"
 
-        # Show desktop notification (if enabled)
-        if self.settings.enable_notifications:
-            self.show_notification(new_status, status_text)
+        self.status_item.set_label(f"Status: {status_text}")
+        return status_text
 
     def show_notification(self, status: str, status_text: str) -> None:
         """Show desktop notification for status change."""
@@ -170,7 +264,8 @@ class PipelineMonitorApp:
         icon_map = {
             "passed": "dialog-ok",
             "failed": "dialog-error",
-            "running": "dialog-warning"
+            "running": "dialog-warning",
+            "stale": "dialog-question"
         }
         icon = icon_map.get(status, "dialog-information")
 
@@ -186,9 +281,34 @@ class PipelineMonitorApp:
             print("notify-send not found, skipping notification")
 
     def check_now(self, _source: Gtk.MenuItem) -> None:
-        """Force an immediate poll."""
+        """Refresh on demand, ignoring repeat clicks within CHECK_NOW_DEBOUNCE_MS."""
+        if self.check_now_source_id is not None:
+            return
         print("Checking pipeline status now...")
-        self.poll_status()
+        last_poll_at = self.monitor.last_poll_at
+        self.monitor.refresh()
+
+        if self.monitor.last_poll_at != last_poll_at:
+            self.save_state()
+            # Restart the background timer so it doesn't poll again right away
+            GLib.source_remove(self.poll_source_id)
+            self.poll_source_id = GLib.timeout_add_seconds(
+                self.settings.poll_interval_seconds,
+                self.poll_status
+            )
+        else:
+            next_poll = round(self.monitor.seconds_until_next_poll())
+            print(f"Status checked recently, showing cached result (next check in {next_poll}s)")
+
+        # Arm the window after the check, so clicks queued while it ran are ignored too
+        self.check_now_source_id = GLib.timeout_add(
+            CHECK_NOW_DEBOUNCE_MS, self._end_check_now_debounce
+        )
+
+    def _end_check_now_debounce(self) -> bool:
+        """Accept Check Now clicks again. Returns False to fire only once."""
+        self.check_now_source_id = None
+        return False
 
     def open_in_github(self, _source: Gtk.MenuItem) -> None:
         """Open GitHub Actions page in browser."""
@@ -214,6 +334,9 @@ class PipelineMonitorApp:
         """Quit the application."""
         print("Quitting...")
         self.monitor.stop()
+        self.save_state()
+        if self.feed_server:
+            self.feed_server.stop()
         Gtk.main_quit()
 
     def run(self) -> None:
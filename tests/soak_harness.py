@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""Soak test harness for the monitor polling loop.
+
+Runs the real PipelineMonitorApp with GTK and AppIndicator stubbed out and
+GLib routed to a fake main loop on a simulated clock, against an in-process
+fake GitHub API with simulated latency, slow and hung responses. The app's
+own timer paths run: the idle first poll, the background timer, bursts of
+Check Now clicks with the timer restart, state snapshots and the status
+feed. It tracks RSS, live object counts, timer drift and how long callbacks
+block the main loop, and reports failures when any of them passes its
+threshold.
+
+Run a long soak from the repo root:
+
+    python tests/soak_harness.py --ticks 2000000
+"""
+
+import argparse
+import contextlib
+import gc
+import heapq
+import importlib
+import json
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class SimulatedClock:
+    """Monotonic clock that only moves when the harness advances it."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMainLoop:
+    """Stand-in for GLib's main loop running idle and timeout sources.
+
+    Like GLib, a source that returns True is re-armed relative to the time
+    it was dispatched, so callback lateness turns into drift, and
+    timeout_add_seconds expirations are rounded to the nearest whole second
+    (offset by timer_perturb, rounding up from a quarter second) so that
+    seconds-timeouts fire together. Each dispatch advances the simulated
+    clock by the real time the callback took (times latency_scale), on top
+    of any simulated time the callback spent itself.
+    """
+
+    def __init__(self, clock, latency_scale=1.0, timer_perturb=0.0):
+        self.clock = clock
+        self.latency_scale = latency_scale
+        self.timer_perturb = timer_perturb
+        self._sources = []
+        self._removed = set()
+        self._next_id = 0
+
+    def timeout_add_seconds(self, interval, callback):
+        return self._add(interval, callback, seconds=True)
+
+    def timeout_add(self, interval_ms, callback):
+        return self._add(interval_ms / 1000, callback, seconds=False)
+
+    def idle_add(self, callback):
+        return self._add(0, callback, seconds=False)
+
+    def source_remove(self, source_id):
+        self._removed.add(source_id)
+
+    def _add(self, interval, callback, seconds):
+        self._next_id += 1
+        now = self.clock()
+        source = (interval, callback, seconds, now)
+        heapq.heappush(self._sources, (self._expiration(now, source), self._next_id, source, 1))
+        return self._next_id
+
+    def _expiration(self, now, source):
+        interval, _, seconds, _ = source
+        expiration = now + interval
+        if seconds:
+            shifted = expiration - self.timer_perturb
+            remainder = shifted % 1
+            expiration = shifted - remainder + (1 if remainder >= 0.25 else 0) + self.timer_perturb
+        return expiration
+
+    def iteration(self):
+        """Dispatch the next due source.
+
+        Returns (source_id, dispatched_at, drift, duration): drift is how far
+        the dispatch lags the source's ideal schedule (armed time plus a
+        whole number of intervals), duration the simulated time the callback
+        blocked the loop.
+        """
+        while True:
+            due_at, source_id, source, count = heapq.heappop(self._sources)
+            if source_id not in self._removed:
+                break
+            self._removed.discard(source_id)
+        interval, callback, _, armed_at = source
+        self.clock.now = max(self.clock.now, due_at)
+        dispatched_at = self.clock.now
+
+        started = time.perf_counter()
+        keep = callback()
+        self.clock.now += (time.perf_counter() - started) * self.latency_scale
+
+        if keep and source_id not in self._removed:
+            heapq.heappush(self._sources, (self._expiration(dispatched_at, source), source_id,
+                                           source, count + 1))
+        self._removed.discard(source_id)
+        drift = dispatched_at - (armed_at + count * interval)
+        return source_id, dispatched_at, drift, self.clock.now - dispatched_at
+
+
+class _GtkStub:
+    """Accepts any Gtk/AppIndicator3 call and records nothing, so it can't leak."""
+
+    def __getattr__(self, name):
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __mro_entries__(self, bases):
+        return (object,)  # For subclasses such as SettingsDialog(Gtk.Dialog)
+
+
+def load_app_module(loop):
+    """Import pipeline_monitor_app with GTK stubbed out and GLib routed to loop."""
+    repository = types.ModuleType("gi.repository")
+    repository.Gtk = _GtkStub()
+    repository.AppIndicator3 = _GtkStub()
+    repository.GLib = loop
+    gi = types.ModuleType("gi")
+    gi.require_version = lambda namespace, version: None
+    gi.repository = repository
+    with patch.dict(sys.modules, {"gi": gi, "gi.repository": repository}):
+        sys.modules.pop("pipeline_monitor_app", None)
+        sys.modules.pop("pipeline_monitor.settings_dialog", None)
+        return importlib.import_module("pipeline_monitor_app")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_app(app_module, clock, config_dir, poll_interval, feed_port=None):
+    """Create a PipelineMonitorApp from a fresh config, polling on clock.
+
+    app_module comes from load_app_module(), which routes its GLib to the
+    fake main loop.
+    """
+    config_path = Path(config_dir) / "config.json"
+    config_path.write_text(json.dumps({
+        "github_repo_url": "example/repo",
+        "api_token": "ghp_soak",
+        "poll_interval_seconds": poll_interval,
+        "enable_notifications": False,
+        "feed_port": feed_port,
+    }))
+    app = app_module.PipelineMonitorApp(str(config_path))
+    app.monitor.clock = clock
+    app.monitor.circuit_breaker.clock = clock
+    return app
+
+
+class FakeGitHubAPI:
+    """In-process replacement for requests.get serving /actions/runs.
+
+    Cycles through run conclusions every status_period requests, supports
+    ETag revalidation and returns a 502 every error_period requests.
+
+    Every request spends latency seconds of simulated time, every
+    slow_period-th request slow_latency seconds. Every hang_period-th
+    request never gets an answer: it ends at the caller's timeout, or after
+    hang_seconds with a reset connection if the caller set no timeout.
+    """
+
+    CONCLUSIONS = ["success", None, "failure", "cancelled", "timed_out"]
+
+    def __init__(self, clock, status_period=7, error_period=101, latency=0.2,
+                 slow_period=53, slow_latency=5.0, hang_period=211, hang_seconds=600):
+        self.clock = clock
+        self.status_period = status_period
+        self.error_period = error_period
+        self.latency = latency
+        self.slow_period = slow_period
+        self.slow_latency = slow_latency
+        self.hang_period = hang_period
+        self.hang_seconds = hang_seconds
+        self.requests = 0
+
+    def __call__(self, url, headers, timeout=None):
+        self.requests += 1
+        if self.requests % self.hang_period == 0:
+            if timeout is not None:
+                self.clock.now += timeout
+                raise requests.Timeout(f"Read timed out after {timeout}s")
+            self.clock.now += self.hang_seconds
+            raise requests.ConnectionError("Connection reset by peer")
+
+        slow = self.requests % self.slow_period == 0
+        self.clock.now += self.slow_latency if slow else self.latency
+
+        headers_out = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"}
+        if self.requests % self.error_period == 0:
+            return _FakeResponse(502, headers_out, "Bad Gateway")
+
+        version = self.requests // self.status_period
+        etag = f'"{version}"'
+        headers_out["ETag"] = etag
+        if headers.get("If-None-Match") == etag:
+            return _FakeResponse(304, headers_out, "")
+
+        conclusion = self.CONCLUSIONS[version % len(self.CONCLUSIONS)]
+        runs = [
+            {"name": "CI", "head_branch": "main", "event": "push", "conclusion": conclusion},
+            {"name": "CI", "head_branch": "main", "event": "push", "conclusion": "success"},
+        ]
+        return _FakeResponse(200, headers_out, json.dumps({"workflow_runs": runs}))
+
+
+class _FakeResponse:
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def rss_bytes():
+    """Return the current resident set size in bytes."""
+    try:
+        statm = Path("/proc/self/statm").read_text()
+        return int(statm.split()[1]) * resource.getpagesize()
+    except OSError:
+        # Peak RSS is the best portable approximation (KiB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class SoakReport:
+    """Measurements from a soak run and the thresholds they are checked against."""
+
+    def __init__(self, thresholds):
+        self.thresholds = thresholds
+        self.ticks = 0
+        self.status_changes = 0
+        self.rss_start = None
+        self.rss_end = None
+        self.objects_start = None
+        self.objects_end = None
+        self.max_drift = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.api_requests = 0
+
+    @property
+    def mean_latency(self):
+        return self.total_latency / self.ticks if self.ticks else 0.0
+
+    def failures(self):
+        """Return a list of threshold violations (empty if the run passed)."""
+        failures = []
+        rss_growth = self.rss_end - self.rss_start
+        if rss_growth > self.thresholds["max_rss_growth_bytes"]:
+            failures.append(f"RSS grew by {rss_growth / 1e6:.1f} MB")
+        object_growth = self.objects_end - self.objects_start
+        if object_growth > self.thresholds["max_object_growth"]:
+            failures.append(f"Live objects grew by {object_growth}")
+        if self.max_drift > self.thresholds["max_drift_seconds"]:
+            failures.append(f"Timer drifted by {self.max_drift:.3f}s")
+        if self.max_latency > self.thresholds["max_latency_seconds"]:
+            failures.append(f"Callback blocked the main loop for {self.max_latency:.3f}s")
+        return failures
+
+    def summary(self):
+        return (
+            f"ticks={self.ticks} api_requests={self.api_requests} "
+            f"status_changes={self.status_changes} "
+            f"rss_growth={(self.rss_end - self.rss_start) / 1e6:.2f}MB "
+            f"object_growth={self.objects_end - self.objects_start} "
+            f"max_drift={self.max_drift * 1000:.3f}ms "
+            f"mean_latency={self.mean_latency * 1000:.3f}ms "
+            f"max_latency={self.max_latency:.3f}s"
+        )
+
+
+DEFAULT_THRESHOLDS = {
+    "max_rss_growth_bytes": 20 * 1024 * 1024,
+    "max_object_growth": 1000,
+    # GLib rounds seconds-timeouts by up to a second; more is real drift
+    "max_drift_seconds": 1.0,
+    # Simulated time, so disk speed doesn't matter; requests time out at 10s
+    "max_latency_seconds": 15.0,
+}
+
+
+def run_soak(ticks, poll_interval=120, thresholds=None, warmup_fraction=0.1, extra_callback=None,
+             click_interval=None, api_options=None):
+    """Run the app's main loop for the given number of source dispatches.
+
+    A burst of three Check Now clicks arrives every click_interval seconds
+    (about 2.5 poll intervals by default). api_options are passed on to
+    FakeGitHubAPI to change its latency model.
+
+    Baselines for RSS and object counts are taken after the warm-up, so
+    one-off caches (status rule memoization, imports) are not reported as
+    leaks.
+    """
+    report = SoakReport({**DEFAULT_THRESHOLDS, **(thresholds or {})})
+    clock = SimulatedClock()
+    loop = FakeMainLoop(clock, timer_perturb=0.4)
+    api = FakeGitHubAPI(clock, **(api_options or {}))
+    warmup_ticks = int(ticks * warmup_fraction)
+
+    with tempfile.TemporaryDirectory() as config_dir, \
+            Path(os.devnull).open("w") as devnull, \
+            contextlib.redirect_stdout(devnull), \
+            patch("requests.get", api):
+        app = build_app(load_app_module(loop), clock, config_dir, poll_interval,
+                        feed_port=free_port())
+
+        def on_status_changed(status):
+            report.status_changes += 1
+
+        app.monitor.on_status_change(on_status_changed)
+        if extra_callback:
+            app.monitor.on_status_change(extra_callback)
+
+        def click_check_now():
+            for _ in range(3):
+                app.check_now(None)
+            return True
+
+        loop.timeout_add(int(click_interval * 1000) if click_interval else poll_interval * 2500 + 137,
+                         click_check_now)
+
+        try:
+            for tick in range(ticks):
+                if tick == warmup_ticks:
+                    gc.collect()
+                    report.rss_start = rss_bytes()
+                    report.objects_start = len(gc.get_objects())
+
+                poll_source_id = app.poll_source_id
+                source_id, _, drift, duration = loop.iteration()
+                report.ticks += 1
+                # Drift of the background timer against its ideal schedule, so
+                # small delays that pile up are caught as well as single late ticks
+                if source_id == poll_source_id:
+                    report.max_drift = max(report.max_drift, drift)
+                report.max_latency = max(report.max_latency, duration)
+                report.total_latency += duration
+        finally:
+            app.quit(None)
+
+    gc.collect()
+    report.rss_end = rss_bytes()
+    report.objects_end = len(gc.get_objects())
+    report.api_requests = api.requests
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the Pipeline Monitor loop")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--interval", type=int, default=120, help="Simulated poll interval in seconds")
+    args = parser.parse_args()
+
+    report = run_soak(args.ticks, poll_interval=args.interval)
+    print(report.summary())
+    failures = report.failures()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
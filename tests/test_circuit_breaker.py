@@ -0,0 +1,52 @@
+from pipeline_monitor.circuit_breaker import CircuitBreaker
+
+
+def test_circuit_opens_after_threshold_failures_and_refuses_requests():
+    """Test that the breaker opens after N consecutive failures."""
+    # Arrange
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=lambda: now[0])
+
+    # Act
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+    # Assert
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_half_open_probe_failure_reopens_circuit():
+    """Test that a failed half-open probe opens the circuit for another cool-down."""
+    # Arrange
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+    breaker.record_failure()
+
+    # Act
+    now[0] = 30.0
+    assert breaker.allow_request(), "Probe should be allowed after the cool-down"
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request(), "Only one probe at a time"
+    breaker.record_failure()
+
+    # Assert
+    assert breaker.state == CircuitBreaker.OPEN
+    now[0] = 59.0
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failure_count():
+    """Test that a success between failures keeps the circuit closed."""
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    # Act
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    # Assert
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failure_count == 1
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
-from pipeline_monitor.github_client import GitHubClient
+import requests
+from pipeline_monitor.github_client import GitHubAPIError, GitHubClient
 
 
 def test_get_pipeline_status_returns_passed_when_workflow_succeeds():
@@ -8,6 +9,7 @@ def test_get_pipeline_status_returns_passed_when_workflow_succeeds():
     # Arrange
     mock_response = Mock()
     mock_response.status_code = 200
+    mock_response.headers = {}
     mock_response.json.return_value = {
         "workflow_runs": [
             {
@@ -43,6 +45,7 @@ def test_get_pipeline_status_returns_failed_when_workflow_fails():
     # Arrange
     mock_response = Mock()
     mock_response.status_code = 200
+    mock_response.headers = {}
     mock_response.json.return_value = {
         "workflow_runs": [
             {
@@ -74,6 +77,7 @@ def test_get_pipeline_status_returns_running_when_workflow_is_in_progress():
     # Arrange
     mock_response = Mock()
     mock_response.status_code = 200
+    mock_response.headers = {}
     mock_response.json.return_value = {
         "workflow_runs": [
             {
@@ -98,3 +102,98 @@ def test_get_pipeline_status_returns_running_when_workflow_is_in_progress():
     # Assert
     assert status == "running", "Should return 'running' when workflow is in progress with null conclusion"
     mock_get.assert_called_once()
+
+
+def test_get_pipeline_status_sends_etag_and_reuses_status_on_not_modified():
+    """Test that a cached ETag is sent and a 304 response returns the last status."""
+    # Arrange
+    first_response = Mock()
+    first_response.status_code = 200
+    first_response.headers = {"ETag": '"abc123"', "X-RateLimit-Remaining": "4999"}
+    first_response.json.return_value = {
+        "workflow_runs": [{"id": 1, "status": "completed", "conclusion": "success"}]
+    }
+    not_modified = Mock()
+    not_modified.status_code = 304
+    not_modified.headers = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "1700000000"}
+
+    client = GitHubClient(repo_owner="example", repo_name="repo", api_token="ghp_test")
+
+    # Act
+    with patch("requests.get", side_effect=[first_response, not_modified]) as mock_get:
+        first = client.get_pipeline_status()
+        second = client.get_pipeline_status()
+
+    # Assert
+    assert first == second == "passed"
+    assert mock_get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"abc123"'
+    not_modified.json.assert_not_called()
+    token = client.token_pool.tokens[0]
+    assert token.remaining == 4999
+    assert token.reset_at == 1700000000
+
+
+def test_restore_ignores_snapshot_from_another_repository():
+    """Test that client state is only restored for the repository it was saved for."""
+    # Arrange
+    source = GitHubClient(repo_owner="example", repo_name="repo", api_token="ghp_test")
+    source.etag = '"abc123"'
+    source.last_status = "failed"
+    source.token_pool.tokens[0].remaining = 1234
+    state = source.snapshot()
+
+    same_repo = GitHubClient(repo_owner="example", repo_name="repo", api_token="ghp_test")
+    other_repo = GitHubClient(repo_owner="example", repo_name="other", api_token="ghp_test")
+
+    # Act / Assert
+    assert same_repo.restore(state) is True
+    assert same_repo.etag == '"abc123"'
+    assert same_repo.last_status == "failed"
+    assert same_repo.token_pool.tokens[0].remaining == 1234
+    assert "ghp_test" not in str(state), "Snapshot must not contain the token"
+    assert other_repo.restore(state) is False
+    assert other_repo.etag is None
+
+
+@pytest.mark.parametrize(
+    "get_kwargs",
+    [
+        {"side_effect": requests.ConnectionError("connection refused")},
+        {"return_value": Mock(status_code=502, headers={})},
+        {"return_value": Mock(status_code=200, headers={}, json=Mock(side_effect=ValueError("not json")))},
+        {"return_value": Mock(status_code=200, headers={}, json=Mock(return_value=["not", "a", "dict"]))},
+        {"return_value": Mock(status_code=200, headers={}, json=Mock(return_value={"workflow_runs": [1]}))},
+        {"return_value": Mock(status_code=200, headers={"X-RateLimit-Remaining": "lots"}, json=Mock(return_value={}))},
+    ],
+)
+def test_get_pipeline_status_raises_github_api_error_on_bad_responses(get_kwargs):
+    """Test that network errors, HTTP errors and malformed responses raise GitHubAPIError."""
+    # Arrange
+    client = GitHubClient(repo_owner="example", repo_name="repo", api_token="ghp_test")
+
+    # Act / Assert
+    with patch("requests.get", **get_kwargs), pytest.raises(GitHubAPIError):
+        client.get_pipeline_status()
+
+
+def test_get_pipeline_status_skips_ignored_runs():
+    """Test that cancelled runs are skipped in favour of the next older run."""
+    # Arrange
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.headers = {}
+    mock_response.json.return_value = {
+        "workflow_runs": [
+            {"id": 3, "name": "CI", "head_branch": "main", "event": "push", "conclusion": "cancelled"},
+            {"id": 2, "name": "CI", "head_branch": "main", "event": "push", "conclusion": "timed_out"},
+            {"id": 1, "name": "CI", "head_branch": "main", "event": "push", "conclusion": "success"},
+        ]
+    }
+    client = GitHubClient(repo_owner="example", repo_name="repo", api_token="ghp_test")
+
+    # Act
+    with patch("requests.get", return_value=mock_response):
+        status = client.get_pipeline_status()
+
+    # Assert
+    assert status == "failed"
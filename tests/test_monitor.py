@@ -1,5 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch, call
+from pipeline_monitor.circuit_breaker import CircuitBreaker
+from pipeline_monitor.github_client import GitHubAPIError
 from pipeline_monitor.monitor import PipelineMonitor
 
 
@@ -39,3 +41,129 @@ def test_monitor_calls_callback_when_status_changes_from_running_to_passed():
 
     # Verify GitHub client was polled twice
     assert mock_github_client.get_pipeline_status.call_count == 2
+
+
+def test_monitor_reports_stale_and_stops_polling_when_api_keeps_failing():
+    """Test that repeated API failures open the circuit and report a stale status."""
+    # Arrange
+    now = [0.0]
+    mock_github_client = Mock()
+    mock_github_client.get_pipeline_status.side_effect = [
+        "passed",
+        GitHubAPIError("HTTP 502"),
+        GitHubAPIError("HTTP 502"),
+        "failed",
+    ]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, clock=lambda: now[0])
+    monitor = PipelineMonitor(github_client=mock_github_client, circuit_breaker=breaker)
+    callback = Mock()
+    monitor.on_status_change(callback)
+
+    # Act
+    monitor._poll_once()  # passed
+    monitor._poll_once()  # first failure
+    monitor._poll_once()  # second failure opens the circuit
+    monitor._poll_once()  # circuit open, API not called
+
+    # Assert
+    assert callback.call_args_list == [call("passed"), call("stale")]
+    assert monitor.last_good_status == "passed"
+    assert breaker.state == CircuitBreaker.OPEN
+    assert mock_github_client.get_pipeline_status.call_count == 3
+
+    # After the cool-down a half-open probe succeeds and closes the circuit
+    now[0] = 61.0
+    monitor._poll_once()
+    assert callback.call_args_list[-1] == call("failed")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_refresh_serves_cached_status_while_fresh_and_polls_when_old():
+    """Test that on-demand refreshes within the freshness window don't call the API."""
+    # Arrange
+    now = [0.0]
+    mock_github_client = Mock()
+    mock_github_client.get_pipeline_status.side_effect = ["running", "passed"]
+    monitor = PipelineMonitor(
+        github_client=mock_github_client,
+        poll_interval=120,
+        refresh_max_age=10,
+        clock=lambda: now[0]
+    )
+
+    # Act / Assert
+    assert monitor.refresh() == "running"
+    now[0] = 5.0
+    assert monitor.refresh() == "running", "Fresh status should come from cache"
+    assert mock_github_client.get_pipeline_status.call_count == 1
+
+    now[0] = 11.0
+    assert monitor.refresh() == "passed"
+    assert mock_github_client.get_pipeline_status.call_count == 2
+
+
+def test_refresh_resets_next_scheduled_poll():
+    """Test that a manual refresh pushes the next background poll a full interval away."""
+    # Arrange
+    now = [0.0]
+    mock_github_client = Mock()
+    mock_github_client.get_pipeline_status.return_value = "passed"
+    monitor = PipelineMonitor(github_client=mock_github_client, poll_interval=120, clock=lambda: now[0])
+    assert monitor.seconds_until_next_poll() == 0
+
+    monitor._poll_once()
+    now[0] = 100.0
+    assert monitor.seconds_until_next_poll() == 20
+
+    # Act
+    monitor.refresh()
+
+    # Assert
+    assert monitor.seconds_until_next_poll() == 120
+
+
+def test_monitor_keeps_last_good_status_until_circuit_opens():
+    """Test that a single transient failure does not flip the status to stale."""
+    # Arrange
+    mock_github_client = Mock()
+    mock_github_client.get_pipeline_status.side_effect = ["passed", GitHubAPIError("HTTP 502"), "passed"]
+    monitor = PipelineMonitor(github_client=mock_github_client, circuit_breaker=CircuitBreaker(failure_threshold=3))
+    callback = Mock()
+    monitor.on_status_change(callback)
+
+    # Act
+    monitor._poll_once()
+    monitor._poll_once()
+    monitor._poll_once()
+
+    # Assert
+    callback.assert_called_once_with("passed")
+    assert monitor.previous_status == "passed"
+
+
+def test_unexpected_error_in_half_open_probe_reopens_circuit():
+    """Test that non-API errors count as failures so the circuit can recover."""
+    # Arrange
+    now = [0.0]
+    mock_github_client = Mock()
+    mock_github_client.get_pipeline_status.side_effect = [
+        GitHubAPIError("HTTP 502"),
+        AttributeError("unexpected"),
+        "passed",
+    ]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, clock=lambda: now[0])
+    monitor = PipelineMonitor(github_client=mock_github_client, circuit_breaker=breaker)
+
+    # Act / Assert
+    monitor._poll_once()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 60.0
+    with pytest.raises(AttributeError):
+        monitor._poll_once()
+    assert breaker.state == CircuitBreaker.OPEN, "Failed probe must reopen the circuit"
+
+    now[0] = 120.0
+    monitor._poll_once()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert monitor.previous_status == "passed"
@@ -0,0 +1,213 @@
+import socketserver
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pipeline_monitor.github_client import GitHubClient
+from pipeline_monitor.poll_cache import PollCache, PollCacheServer
+
+RUNS_URL = "https://api.github.com/repos/example/repo/actions/runs"
+
+
+def make_response(status_code=200, text='{"workflow_runs": []}', headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def cache_server(tmp_path):
+    """Run a PollCacheServer on a temporary socket."""
+    servers = []
+
+    def start(cache):
+        server = PollCacheServer(str(tmp_path / "cache.sock"), cache)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_concurrent_identical_requests_share_one_upstream_request():
+    """Test that requests for the same URL in flight are merged."""
+    # Arrange
+    release = threading.Event()
+
+    def slow_fetch(url, headers, timeout):
+        release.wait(timeout=5)
+        return make_response()
+
+    cache = PollCache(fetch=Mock(side_effect=slow_fetch))
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(RUNS_URL)))
+        for _ in range(5)
+    ]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # Assert
+    assert cache.upstream_requests == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+
+
+def test_expired_response_is_revalidated_with_etag():
+    """Test that the daemon itself sends If-None-Match once the TTL has passed."""
+    # Arrange
+    now = [0.0]
+    fetch = Mock(side_effect=[
+        make_response(headers={"ETag": '"v1"', "X-RateLimit-Remaining": "4999"}),
+        make_response(status_code=304, text="", headers={"X-RateLimit-Remaining": "42"}),
+    ])
+    cache = PollCache(token="ghp_daemon", ttl=30, fetch=fetch, clock=lambda: now[0])
+
+    # Act
+    first = cache.get(RUNS_URL)
+    cache.get(RUNS_URL)  # fresh, served from cache
+    now[0] = 31.0
+    second = cache.get(RUNS_URL)
+
+    # Assert
+    assert fetch.call_count == 2
+    assert fetch.call_args_list[0].kwargs["headers"] == {"Authorization": "Bearer ghp_daemon"}
+    assert fetch.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert all(call.kwargs["timeout"] for call in fetch.call_args_list)
+    assert second["status_code"] == 200
+    assert second["body"] == first["body"]
+    # The daemon's rate-limit budget is never passed on to clients
+    assert "X-RateLimit-Remaining" not in first["headers"]
+    assert "X-RateLimit-Remaining" not in second["headers"]
+
+
+def test_cache_only_serves_workflow_run_listings():
+    """Test that the daemon's token can't be used to fetch arbitrary URLs."""
+    # Arrange
+    fetch = Mock()
+    cache = PollCache(token="ghp_daemon", fetch=fetch)
+
+    # Act
+    response = cache.get("https://api.github.com/user")
+
+    # Assert
+    assert "error" in response
+    fetch.assert_not_called()
+
+
+def test_github_clients_poll_through_shared_daemon(cache_server, tmp_path):
+    """Test that several GitHubClients on one host cause one upstream request."""
+    # Arrange
+    fetch = Mock(return_value=make_response(
+        text='{"workflow_runs": [{"conclusion": "failure"}]}',
+        headers={"ETag": '"v1"', "X-RateLimit-Remaining": "4999"},
+    ))
+    cache_server(PollCache(token="ghp_daemon", fetch=fetch))
+    clients = [
+        GitHubClient("example", "repo", f"ghp_user{i}", cache_socket=str(tmp_path / "cache.sock"))
+        for i in range(3)
+    ]
+
+    # Act
+    with patch("requests.get") as direct_get:
+        statuses = [client.get_pipeline_status() for client in clients]
+        statuses.append(clients[0].get_pipeline_status())  # conditional, answered with 304
+
+    # Assert
+    assert statuses == ["failed"] * 4
+    assert fetch.call_count == 1
+    assert fetch.call_args.kwargs["headers"]["Authorization"] == "Bearer ghp_daemon"
+    direct_get.assert_not_called()
+    # Client tokens never reach the daemon, so their budgets stay unknown
+    assert all(client.token_pool.tokens[0].remaining is None for client in clients)
+
+
+def test_github_client_ignores_socket_in_shared_directory(cache_server, tmp_path):
+    """Test that a socket other users could have created is not trusted."""
+    # Arrange
+    fetch = Mock()
+    cache_server(PollCache(token="ghp_daemon", fetch=fetch))
+    tmp_path.chmod(0o1777)
+    client = GitHubClient("example", "repo", "ghp_test", cache_socket=str(tmp_path / "cache.sock"))
+    response = make_response(headers={})
+    response.json.return_value = {"workflow_runs": [{"conclusion": "success"}]}
+
+    # Act
+    with patch("requests.get", return_value=response) as direct_get:
+        status = client.get_pipeline_status()
+
+    # Assert
+    assert status == "passed"
+    fetch.assert_not_called()
+    direct_get.assert_called_once()
+
+
+def test_github_client_falls_back_to_direct_request_without_daemon(tmp_path):
+    """Test that a missing daemon doesn't break polling."""
+    # Arrange
+    client = GitHubClient("example", "repo", "ghp_test", cache_socket=str(tmp_path / "missing.sock"))
+    response = make_response(headers={})
+    response.json.return_value = {"workflow_runs": [{"conclusion": "success"}]}
+
+    # Act
+    with patch("requests.get", return_value=response) as direct_get:
+        status = client.get_pipeline_status()
+
+    # Assert
+    assert status == "passed"
+    direct_get.assert_called_once()
+
+
+def test_github_client_falls_back_when_daemon_token_lacks_access(cache_server, tmp_path):
+    """Test that a 404 from the daemon is retried with the user's own token."""
+    # Arrange
+    cache_server(PollCache(token="ghp_daemon", fetch=Mock(return_value=make_response(404, "{}"))))
+    client = GitHubClient("example", "repo", "ghp_test", cache_socket=str(tmp_path / "cache.sock"))
+    response = make_response(headers={})
+    response.json.return_value = {"workflow_runs": [{"conclusion": "success"}]}
+
+    # Act
+    with patch("requests.get", return_value=response) as direct_get:
+        status = client.get_pipeline_status()
+
+    # Assert
+    assert status == "passed"
+    assert direct_get.call_args.kwargs["headers"]["Authorization"] == "Bearer ghp_test"
+
+
+def test_github_client_falls_back_on_truncated_daemon_reply(tmp_path):
+    """Test that a garbled reply is treated like an unavailable daemon."""
+    # Arrange
+    class TruncatingHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.rfile.readline()
+            self.wfile.write(b'{"status_code": 20\n')
+
+    server = socketserver.ThreadingUnixStreamServer(str(tmp_path / "cache.sock"), TruncatingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = GitHubClient("example", "repo", "ghp_test", cache_socket=str(tmp_path / "cache.sock"))
+    response = make_response(headers={})
+    response.json.return_value = {"workflow_runs": [{"conclusion": "failure"}]}
+
+    # Act
+    try:
+        with patch("requests.get", return_value=response) as direct_get:
+            status = client.get_pipeline_status()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Assert
+    assert status == "failed"
+    direct_get.assert_called_once()
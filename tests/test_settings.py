@@ -1,6 +1,6 @@
 import json
 import pytest
-from pipeline_monitor.settings import Settings
+from pipeline_monitor.settings import CONFIG_VERSION, Settings, SettingsError
 
 
 def test_save_settings_to_json_file(tmp_path):
@@ -23,9 +23,14 @@ def test_save_settings_to_json_file(tmp_path):
         saved_data = json.load(f)
 
     assert saved_data["github_repo_url"] == "https://github.com/example/repo"
-    assert saved_data["api_token"] == "ghp_test1234567890"
     assert saved_data["poll_interval_seconds"] == 300
 
+    # The token is kept out of config.json in a file only the owner can read
+    assert "api_token" not in saved_data
+    secrets_file = tmp_path / "config.secrets.json"
+    assert json.loads(secrets_file.read_text())["api_token"] == "ghp_test1234567890"
+    assert secrets_file.stat().st_mode & 0o777 == 0o600
+
 
 def test_load_settings_from_json_file(tmp_path):
     """Test that Settings can load configuration from a JSON file."""
@@ -47,3 +52,148 @@ def test_load_settings_from_json_file(tmp_path):
     assert loaded_settings.github_repo_url == "https://github.com/test/project"
     assert loaded_settings.api_token == "ghp_secret9876543210"
     assert loaded_settings.poll_interval_seconds == 600
+
+
+def test_status_rules_round_trip_through_json_file(tmp_path):
+    """Test that custom status rules are saved and loaded with the settings."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    rules = [{"branch": "main", "conclusion": "cancelled", "status": "failed"}]
+    Settings(
+        github_repo_url="test/project",
+        api_token="ghp_secret",
+        poll_interval_seconds=120,
+        status_rules=rules
+    ).save(config_file)
+
+    # Act
+    loaded_settings = Settings.load(config_file)
+
+    # Assert
+    assert loaded_settings.status_rules == rules
+
+
+def test_load_migrates_unversioned_config_with_inline_token(tmp_path):
+    """Test that an original-format config.json still loads."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({
+        "github_repo_url": "test/project",
+        "api_token": "ghp_inline",
+        "poll_interval_seconds": 120
+    }))
+
+    # Act
+    loaded_settings = Settings.load(config_file)
+    loaded_settings.save(config_file)
+
+    # Assert
+    assert loaded_settings.api_token == "ghp_inline"
+    assert loaded_settings.enable_notifications is True
+    saved_data = json.loads(config_file.read_text())
+    assert saved_data["version"] == CONFIG_VERSION
+    assert "api_token" not in saved_data
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"poll_interval_seconds": "120"},
+        {"poll_interval_seconds": 0},
+        {"enable_notifications": "yes"},
+        {"status_rules": ["not-a-rule"]},
+        {"unexpected": True},
+        {"version": CONFIG_VERSION + 1},
+        {"version": 0},
+        {"version": -1},
+        {"api_tokens": [5]},
+        {"api_tokens": [{"owner": "my-org"}]},
+        {"api_tokens": [{"token": "ghp_x", "owner": 3}]},
+        {"feed_port": 0},
+        {"feed_port": 99999},
+        {"api_token": None},
+        {"api_token": "", "api_tokens": []},
+    ],
+)
+def test_load_rejects_invalid_config(tmp_path, overrides):
+    """Test that invalid values are reported when loading, not later."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    data = {"github_repo_url": "test/project", "api_token": "ghp_x", "poll_interval_seconds": 120}
+    data.update(overrides)
+    config_file.write_text(json.dumps(data))
+
+    # Act / Assert
+    with pytest.raises(SettingsError):
+        Settings.load(config_file)
+
+
+def test_load_reparses_config_only_when_file_changes(tmp_path):
+    """Test that loads are cached by mtime and pick up edits."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    Settings("test/project", "ghp_x", 120).save(config_file)
+
+    # Act
+    first = Settings.load(config_file)
+    first.status_rules.append({"status": "failed"})  # must not leak into the cache
+    second = Settings.load(config_file)
+    Settings("test/project", "ghp_x", 300).save(config_file)
+    third = Settings.load(config_file)
+
+    # Assert
+    assert second.status_rules == []
+    assert third.poll_interval_seconds == 300
+
+
+def test_load_accepts_api_tokens_without_api_token(tmp_path):
+    """Test that a config using only the token pool needs no api_token."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({
+        "version": CONFIG_VERSION,
+        "github_repo_url": "test/project",
+        "api_tokens": [{"token": "ghp_org", "owner": "test"}],
+        "poll_interval_seconds": 120
+    }))
+
+    # Act
+    loaded_settings = Settings.load(config_file)
+
+    # Assert
+    assert loaded_settings.api_token is None
+    assert loaded_settings.api_tokens == [{"token": "ghp_org", "owner": "test"}]
+
+
+def test_token_edited_into_config_overrides_saved_secret(tmp_path):
+    """Test that a token edited into config.json by hand is not shadowed by the secrets file."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    Settings("test/project", "ghp_old", 120).save(config_file)
+    data = json.loads(config_file.read_text())
+    data["api_token"] = "ghp_new"
+    config_file.write_text(json.dumps(data))
+
+    # Act
+    loaded_settings = Settings.load(config_file)
+    loaded_settings.save(config_file)
+
+    # Assert
+    assert loaded_settings.api_token == "ghp_new"
+    assert "api_token" not in json.loads(config_file.read_text())
+    secrets_file = tmp_path / "config.secrets.json"
+    assert json.loads(secrets_file.read_text())["api_token"] == "ghp_new"
+
+
+def test_load_reports_unreadable_secrets_file(tmp_path):
+    """Test that I/O errors surface as SettingsError, which the app reports."""
+    # Arrange
+    config_file = tmp_path / "config.json"
+    Settings("test/project", "ghp_x", 120).save(config_file)
+    secrets_file = tmp_path / "config.secrets.json"
+    secrets_file.unlink()
+    secrets_file.mkdir()
+
+    # Act / Assert
+    with pytest.raises(SettingsError):
+        Settings.load(config_file)
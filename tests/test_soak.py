@@ -0,0 +1,126 @@
+"""Short soak runs of the monitor loop; see soak_harness.py for long runs."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from soak_harness import (
+    FakeGitHubAPI,
+    FakeMainLoop,
+    SimulatedClock,
+    build_app,
+    load_app_module,
+    run_soak,
+)
+
+# Raise for a real soak, e.g. SOAK_TICKS=2000000 pytest tests/test_soak.py
+SOAK_TICKS = int(os.environ.get("SOAK_TICKS", "20000"))
+
+
+def test_monitor_loop_runs_without_leaks_or_drift():
+    """Test that polling many times keeps memory, object count and timing flat."""
+    # Act
+    report = run_soak(SOAK_TICKS)
+
+    # Assert
+    assert report.ticks == SOAK_TICKS
+    assert report.status_changes > 0, "Fake API should exercise status changes"
+    assert report.failures() == [], report.summary()
+
+
+def test_harness_detects_leaking_callback():
+    """Test that the harness flags a callback that holds on to every status."""
+    # Arrange
+    leaked = []
+
+    # Act
+    report = run_soak(SOAK_TICKS, extra_callback=lambda status: leaked.append([status]))
+
+    # Assert
+    assert any("Live objects grew" in failure for failure in report.failures())
+
+
+def test_harness_detects_drift_from_slow_api():
+    """Test that API responses slower than the poll interval fail the soak."""
+    # Act
+    report = run_soak(2000, poll_interval=5, api_options={"slow_period": 3, "slow_latency": 8.0})
+
+    # Assert
+    assert any("Timer drifted" in failure for failure in report.failures())
+
+
+def test_harness_detects_request_without_timeout(monkeypatch):
+    """Test that a hung request blocking the main loop shows up as drift."""
+    # Arrange
+    monkeypatch.setattr("pipeline_monitor.github_client.REQUEST_TIMEOUT", None)
+
+    # Act
+    report = run_soak(2000)
+
+    # Assert
+    assert any("Timer drifted" in failure for failure in report.failures())
+
+
+def test_fake_main_loop_turns_slow_callbacks_into_drift():
+    """Test that callbacks slower than the interval push later ticks back."""
+    # Arrange
+    clock = SimulatedClock()
+    loop = FakeMainLoop(clock, latency_scale=1.0)
+
+    def slow_callback():
+        clock.now += 1.5  # simulated work longer than the 1s interval
+        return True
+
+    loop.timeout_add_seconds(1, slow_callback)
+
+    # Act
+    ticks = [loop.iteration() for _ in range(3)]
+
+    # Assert
+    assert [dispatched for _, dispatched, _, _ in ticks] == pytest.approx([1.0, 2.5, 4.0], abs=0.01)
+    assert [drift for _, _, drift, _ in ticks] == pytest.approx([0.0, 0.5, 1.0], abs=0.01)
+
+
+def test_fake_main_loop_rounds_seconds_timeouts_like_glib():
+    """Test that seconds-timeouts fire on whole seconds (plus the perturbation)."""
+    # Arrange
+    clock = SimulatedClock(start=10.3)
+    loop = FakeMainLoop(clock, timer_perturb=0.4)
+    loop.timeout_add_seconds(5, lambda: True)
+
+    # Act
+    ticks = [loop.iteration() for _ in range(2)]
+
+    # Assert
+    assert [dispatched for _, dispatched, _, _ in ticks] == pytest.approx([15.4, 20.4], abs=0.01)
+
+
+def test_check_now_polls_once_and_restarts_poll_timer(tmp_path):
+    """Test that a burst of clicks on the real app polls once and moves the next background poll."""
+    # Arrange
+    clock = SimulatedClock()
+    loop = FakeMainLoop(clock)
+    api = FakeGitHubAPI(clock)
+    app_module = load_app_module(loop)
+    with patch("requests.get", api):
+        app = build_app(app_module, clock, tmp_path, poll_interval=120)
+        loop.iteration()  # idle first poll
+        first_timer = app.poll_source_id
+        clock.now = 50.0
+
+        # Act
+        for _ in range(3):
+            app.check_now(None)
+        checked_at = clock.now
+        requests_after_clicks = api.requests
+        _, window_closed_at, _, _ = loop.iteration()
+        next_source_id, next_poll_at, _, _ = loop.iteration()
+        app.quit(None)
+
+    # Assert
+    assert requests_after_clicks == 2
+    assert window_closed_at == pytest.approx(checked_at + app_module.CHECK_NOW_DEBOUNCE_MS / 1000)
+    assert app.poll_source_id != first_timer
+    assert next_source_id == app.poll_source_id
+    assert next_poll_at == pytest.approx(50.0 + 120, abs=1)
+    assert (tmp_path / "state.json").exists()
@@ -0,0 +1,55 @@
+import json
+from unittest.mock import Mock
+from pipeline_monitor.monitor import PipelineMonitor
+from pipeline_monitor.state_store import StateStore
+
+
+def test_save_and_load_round_trips_monitor_state(tmp_path):
+    """Test that a saved snapshot restores the last status into a new monitor."""
+    # Arrange
+    state_file = tmp_path / "state.json"
+    client = Mock()
+    client.get_pipeline_status.return_value = "failed"
+    client.snapshot.return_value = {"repo": "example/repo", "etag": '"abc"'}
+    monitor = PipelineMonitor(github_client=client)
+    monitor._poll_once()
+
+    # Act
+    StateStore(state_file).save(monitor.snapshot())
+
+    restored_client = Mock()
+    restored_client.restore.return_value = True
+    restored = PipelineMonitor(github_client=restored_client)
+    restored.restore(StateStore(state_file).load())
+
+    # Assert
+    assert restored.previous_status == "failed"
+    restored_client.restore.assert_called_once_with({"repo": "example/repo", "etag": '"abc"'})
+
+
+def test_save_skips_write_when_state_is_unchanged(tmp_path):
+    """Test that saving identical state twice only writes the file once."""
+    # Arrange
+    store = StateStore(tmp_path / "state.json")
+
+    # Act / Assert
+    assert store.save({"previous_status": "passed"}) is True
+    assert store.save({"previous_status": "passed"}) is False
+    assert store.save({"previous_status": "failed"}) is True
+    assert list(tmp_path.iterdir()) == [tmp_path / "state.json"]
+
+
+def test_load_returns_none_for_corrupt_or_missing_file(tmp_path):
+    """Test that a corrupt or missing snapshot results in a cold start."""
+    # Arrange
+    state_file = tmp_path / "state.json"
+    store = StateStore(state_file)
+
+    # Act / Assert
+    assert store.load() is None
+
+    state_file.write_text('{"version": 1, "state": ')
+    assert store.load() is None
+
+    state_file.write_text(json.dumps({"version": 999, "state": {}}))
+    assert store.load() is None
@@ -0,0 +1,149 @@
+import http.client
+import json
+import pytest
+from pipeline_monitor.status_feed import StatusFeed, StatusFeedServer
+
+
+@pytest.fixture
+def feed_server():
+    """Run a StatusFeedServer on a free local port."""
+    feed = StatusFeed("example/repo", clock=lambda: 1700000000.0)
+    server = StatusFeedServer(feed, port=0, snapshot_interval=0.05)
+    server.start()
+    yield server
+    server.stop()
+
+
+def read_sse_events(response, count):
+    """Read count events from a Server-Sent Events response."""
+    events = []
+    fields = {}
+    while len(events) < count:
+        line = response.fp.readline().decode().rstrip("\n")
+        if line:
+            key, _, value = line.partition(": ")
+            fields[key] = value
+        elif fields:
+            events.append((fields["event"], int(fields["id"]), json.loads(fields["data"])))
+            fields = {}
+    return events
+
+
+def test_events_since_resumes_and_detects_dropped_history():
+    """Test that clients can resume from an event id still in the history."""
+    # Arrange
+    feed = StatusFeed("example/repo", history_size=3)
+    for status in ["running", "passed", "running", "failed"]:
+        feed.publish(status)
+
+    # Act / Assert
+    assert [e["status"] for e in feed.events_since(2)] == ["running", "failed"]
+    assert feed.events_since(4) == []
+    assert feed.events_since(0) is None, "Event 1 was dropped, so resuming from 0 must resync"
+    assert feed.snapshot()["status"] == "failed"
+
+
+def test_event_ids_continue_from_previous_run():
+    """Test that ids from an earlier run are never reused after a restart."""
+    # Arrange
+    feed = StatusFeed("example/repo", history_size=3, last_id=41)
+
+    # Act
+    event = feed.publish("passed")
+
+    # Assert
+    assert event["id"] == 42
+    assert feed.events_since(40) is None, "Client from the previous run must resync"
+    assert feed.events_since(41) == [event]
+
+
+def test_history_file_survives_restart_and_stays_bounded(tmp_path):
+    """Test that a new feed reloads the history and keeps ids increasing."""
+    # Arrange
+    history_file = tmp_path / "history.ndjson"
+    feed = StatusFeed("example/repo", history_size=2, history_file=history_file)
+    for status in ["running", "failed", "running", "passed", "failed"]:
+        feed.publish(status)
+
+    # Act
+    restarted = StatusFeed("example/repo", history_size=2, history_file=history_file)
+    event = restarted.publish("passed")
+
+    # Assert
+    assert len(history_file.read_text().splitlines()) <= 4
+    assert restarted.snapshot()["status"] == "passed"
+    assert event["id"] == 6
+    assert [e["status"] for e in restarted.events()] == ["failed", "passed"]
+
+
+def test_seed_sets_snapshot_without_change_event():
+    """Test that a restored status is not re-announced as a change."""
+    # Arrange
+    feed = StatusFeed("example/repo", last_id=7)
+
+    # Act
+    feed.seed("failed")
+
+    # Assert
+    assert feed.events() == []
+    assert feed.snapshot()["status"] == "failed"
+    assert feed.snapshot()["id"] == 7
+
+
+def test_export_ndjson_writes_one_event_per_line(tmp_path):
+    """Test bulk export of the history to newline-delimited JSON."""
+    # Arrange
+    feed = StatusFeed("example/repo", clock=lambda: 1700000000.0)
+    feed.publish("running")
+    feed.publish("passed")
+    export_file = tmp_path / "history.ndjson"
+
+    # Act
+    count = feed.export_ndjson(export_file)
+
+    # Assert
+    lines = export_file.read_text().splitlines()
+    assert count == 2
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "time": 1700000000.0, "repo": "example/repo", "status": "running"},
+        {"id": 2, "time": 1700000000.0, "repo": "example/repo", "status": "passed"},
+    ]
+
+
+def test_sse_stream_resumes_from_last_event_id(feed_server):
+    """Test that a reconnecting client receives only the events it missed."""
+    # Arrange
+    feed = feed_server.feed
+    for status in ["running", "failed", "passed"]:
+        feed.publish(status)
+    conn = http.client.HTTPConnection("127.0.0.1", feed_server.server_address[1], timeout=5)
+
+    # Act
+    conn.request("GET", "/events", headers={"Last-Event-ID": "1"})
+    response = conn.getresponse()
+    events = read_sse_events(response, 3)
+    conn.close()
+
+    # Assert
+    assert response.getheader("Content-Type") == "text/event-stream"
+    assert [(kind, event_id) for kind, event_id, _ in events] == [
+        ("status", 2), ("status", 3), ("snapshot", 3)
+    ]
+    assert events[2][2]["status"] == "passed"
+
+
+def test_sse_stream_starts_new_clients_with_snapshot(feed_server):
+    """Test that a client without an event id first gets the current status."""
+    # Arrange
+    feed_server.feed.publish("failed")
+    conn = http.client.HTTPConnection("127.0.0.1", feed_server.server_address[1], timeout=5)
+
+    # Act
+    conn.request("GET", "/events")
+    events = read_sse_events(conn.getresponse(), 1)
+    conn.close()
+
+    # Assert
+    assert events == [("snapshot", 1, {
+        "id": 1, "time": 1700000000.0, "repo": "example/repo", "status": "failed"
+    })]
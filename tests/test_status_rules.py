@@ -0,0 +1,70 @@
+import pytest
+from pipeline_monitor.status_rules import IGNORE, StatusRules
+
+
+@pytest.mark.parametrize(
+    "conclusion, expected",
+    [
+        (None, "running"),
+        ("success", "passed"),
+        ("neutral", "passed"),
+        ("failure", "failed"),
+        ("timed_out", "failed"),
+        ("startup_failure", "failed"),
+        ("action_required", "failed"),
+        ("cancelled", IGNORE),
+        ("skipped", IGNORE),
+    ],
+)
+def test_default_rules_map_every_conclusion(conclusion, expected):
+    """Test that the built-in rules cover all GitHub Actions conclusions."""
+    # Arrange
+    rules = StatusRules()
+
+    # Act
+    status = rules.evaluate("CI", "main", "push", conclusion)
+
+    # Assert
+    assert status == expected
+
+
+def test_user_rules_override_defaults_by_specificity_and_priority():
+    """Test that more specific and higher-priority user rules win."""
+    # Arrange
+    rules = StatusRules([
+        # Failures of the nightly workflow don't break the build
+        {"workflow": "Nightly", "conclusion": "failure", "status": IGNORE},
+        # Cancelled runs on main count as failures
+        {"branch": "main", "conclusion": "cancelled", "status": "failed"},
+        # Any pull_request run shows as running, unless something outranks it
+        {"event": "pull_request", "status": "running", "priority": -1},
+        {"workflow": "*", "event": "pull_request", "conclusion": "failure",
+         "status": "failed", "priority": 5},
+    ])
+
+    # Act / Assert
+    assert rules.evaluate("Nightly", "main", "schedule", "failure") == IGNORE
+    assert rules.evaluate("CI", "main", "push", "failure") == "failed"
+    assert rules.evaluate("CI", "main", "push", "cancelled") == "failed"
+    assert rules.evaluate("CI", "dev", "push", "cancelled") == IGNORE
+    assert rules.evaluate("CI", "dev", "pull_request", "failure") == "failed"
+    assert rules.evaluate("CI", "dev", "pull_request", "success") == "passed"
+
+
+def test_unknown_conclusion_uses_default_status():
+    """Test that conclusions without a matching rule fall back to the default status."""
+    # Arrange
+    rules = StatusRules(default_status="running")
+
+    # Act / Assert
+    assert rules.evaluate("CI", "main", "push", "something_new") == "running"
+
+
+def test_invalid_rule_raises_value_error():
+    """Test that malformed rules are rejected when compiled."""
+    with pytest.raises(ValueError):
+        StatusRules([{"conclusion": "failure"}])
+    with pytest.raises(ValueError):
+        StatusRules([{"repo": "example/repo", "status": "failed"}])
+    with pytest.raises(ValueError):
+        StatusRules([{"conclusion": "failure", "status": "pased"}])
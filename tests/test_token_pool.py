@@ -0,0 +1,146 @@
+import sys
+import pytest
+from unittest.mock import Mock, patch
+from pipeline_monitor.github_client import GitHubAPIError, GitHubClient
+from pipeline_monitor.token_pool import (
+    NoTokenError,
+    Token,
+    TokenPool,
+    TokenRefreshError,
+    github_app_token_refresher,
+)
+
+
+def test_acquire_picks_token_with_most_remaining_budget():
+    """Test that the pool rotates to whichever token has the largest budget."""
+    # Arrange
+    a, b = Token("ghp_a"), Token("ghp_b")
+    pool = TokenPool([a, b], clock=lambda: 1000)
+
+    # Act
+    pool.record(a, remaining=10, reset_at=2000)
+    pool.record(b, remaining=4000, reset_at=2000)
+
+    # Assert
+    assert pool.acquire() is b
+    pool.record(b, remaining=5, reset_at=2000)
+    assert pool.acquire() is a
+
+
+def test_acquire_treats_reset_budget_as_full():
+    """Test that a token whose rate-limit window has reset is preferred again."""
+    # Arrange
+    now = [1000]
+    a, b = Token("ghp_a"), Token("ghp_b")
+    pool = TokenPool([a, b], clock=lambda: now[0])
+    pool.record(a, remaining=0, reset_at=1500)
+    pool.record(b, remaining=100, reset_at=5000)
+
+    # Act / Assert
+    assert pool.acquire() is b
+    now[0] = 1600
+    assert pool.acquire() is a
+
+
+def test_acquire_prefers_tokens_scoped_to_repo_owner():
+    """Test that owner-scoped tokens are used for their owner's repos only."""
+    # Arrange
+    general = Token("ghp_general")
+    org = Token("ghp_org", owner="my-org")
+    pool = TokenPool([general, org])
+
+    # Act / Assert
+    assert pool.acquire("my-org") is org
+    assert pool.acquire("someone-else") is general
+
+
+def test_acquire_never_uses_tokens_scoped_to_another_owner():
+    """Test that an owner-scoped token is not a fallback for other owners."""
+    # Arrange
+    pool = TokenPool([Token("ghp_org", owner="my-org")])
+
+    # Act / Assert
+    assert not pool.has_token_for("someone-else")
+    with pytest.raises(NoTokenError):
+        pool.acquire("someone-else")
+
+
+def test_acquire_refreshes_expiring_app_token_ahead_of_time():
+    """Test that installation tokens are refreshed before they expire."""
+    # Arrange
+    now = [1000]
+    refresh = Mock(side_effect=[("ghs_first", 4600), ("ghs_second", 8200)])
+    token = Token(None, expires_at=0, refresh=refresh)
+    pool = TokenPool([token], clock=lambda: now[0])
+
+    # Act / Assert
+    assert pool.acquire().value == "ghs_first"
+    now[0] = 4000  # still valid for 600s
+    assert pool.acquire().value == "ghs_first"
+    now[0] = 4400  # expires within the refresh margin
+    assert pool.acquire().value == "ghs_second"
+    assert refresh.call_count == 2
+
+
+def test_from_config_rejects_unknown_entries():
+    """Test that malformed token entries are reported at startup."""
+    with pytest.raises(ValueError):
+        TokenPool.from_config([{"owner": "my-org"}])
+    with pytest.raises(ValueError):
+        TokenPool.from_config([])
+
+
+def test_github_client_records_rate_limit_for_the_token_used():
+    """Test that GitHubClient sends the pool's token and feeds back its budget."""
+    # Arrange
+    a, b = Token("ghp_a"), Token("ghp_b")
+    pool = TokenPool([a, b])
+    pool.record(a, remaining=4000, reset_at=None)
+    pool.record(b, remaining=3000, reset_at=None)
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.headers = {"X-RateLimit-Remaining": "2500"}
+    mock_response.json.return_value = {"workflow_runs": []}
+    client = GitHubClient(repo_owner="example", repo_name="repo", api_token=pool)
+
+    # Act
+    with patch("requests.get", return_value=mock_response) as mock_get:
+        client.get_pipeline_status()
+        client.get_pipeline_status()
+
+    # Assert
+    sent = [c.kwargs["headers"]["Authorization"] for c in mock_get.call_args_list]
+    assert sent == ["Bearer ghp_a", "Bearer ghp_b"]
+    assert a.remaining == 2500 and b.remaining == 2500
+
+
+def test_app_token_refresh_failures_raise_token_refresh_error(tmp_path):
+    """Test that a bad mint response surfaces as TokenRefreshError, not KeyError."""
+    # Arrange
+    key_file = tmp_path / "app.pem"
+    key_file.write_text("not a real key")
+    fake_jwt = Mock(encode=Mock(return_value="app-jwt"))
+    response = Mock()
+    response.json.return_value = {"token": "ghs_x"}  # no expires_at
+    refresh = github_app_token_refresher(1, 2, str(key_file))
+
+    # Act
+    with patch.dict(sys.modules, {"jwt": fake_jwt}), \
+            patch("requests.post", return_value=response) as mock_post, \
+            pytest.raises(TokenRefreshError):
+        refresh()
+
+    # Assert
+    assert mock_post.call_args.kwargs["timeout"]
+
+
+def test_github_client_reports_failed_token_refresh_as_api_error():
+    """Test that refresh failures go through the circuit breaker like other API errors."""
+    # Arrange
+    token = Token(None, expires_at=0, refresh=Mock(side_effect=TokenRefreshError("bad key")))
+    client = GitHubClient(repo_owner="example", repo_name="repo", api_token=TokenPool([token]))
+
+    # Act / Assert
+    with patch("requests.get") as mock_get, pytest.raises(GitHubAPIError):
+        client.get_pipeline_status()
+    mock_get.assert_not_called()
@@ -158,3 +158,19 @@ def test_tray_icon_updates_icon_when_status_changes_from_running_to_passed():
         f"Expected icon_name to change to 'dialog-ok' after updating status to 'passed', "
         f"but got: {tray_icon.icon_name}"
     )
+
+
+def test_tray_icon_displays_question_icon_when_status_is_stale():
+    """Test that tray icon shows a distinct indicator when the status is stale.
+
+    When the GitHub API is unreachable the monitor reports "stale"; the icon
+    must not look like any real pipeline result.
+    """
+    # Arrange
+    from pipeline_monitor.tray_icon import TrayIcon
+
+    # Act
+    tray_icon = TrayIcon(icon_name="pipeline-monitor", title="Pipeline Monitor", status="stale")
+
+    # Assert
+    assert tray_icon.icon_name == "dialog-question"